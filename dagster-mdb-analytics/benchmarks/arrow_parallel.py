@@ -0,0 +1,69 @@
+"""Compare `CollectionArrowLoaderParallel` against the serial `CollectionArrowLoader`.
+
+Loads the same collection with both loaders through `mongodb_collection` and reports
+wall-clock time, CPU time and the speed-up of the parallel load. Run it on a multi-core
+machine against a reachable MongoDB, e.g. one with the `sample_analytics` dataset:
+
+    python benchmarks/arrow_parallel.py --connection-url mongodb://localhost:27017 \
+        --database sample_analytics --collection transactions --workers 8
+"""
+
+import argparse
+import os
+import time
+from typing import Any, Dict
+
+from dagster_mdb_analytics.mongodb import mongodb_collection
+
+
+def run_load(args: argparse.Namespace, parallel: bool) -> Dict[str, Any]:
+    resource = mongodb_collection(
+        connection_url=args.connection_url,
+        database=args.database,
+        collection=args.collection,
+        parallel=parallel,
+        batch_strategy=args.batch_strategy,
+        chunk_size=args.chunk_size,
+        data_item_format="arrow",
+    )
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    rows = sum(table.num_rows for table in resource)
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+    return {"rows": rows, "wall_s": wall, "cpu_s": cpu, "rows_per_s": rows / wall}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connection-url", default="mongodb://localhost:27017")
+    parser.add_argument("--database", default="sample_analytics")
+    parser.add_argument("--collection", default="transactions")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument(
+        "--batch-strategy", choices=["skip", "range", "keyset"], default="range"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # size of the dlt extract pool that runs the deferred batches
+    os.environ["EXTRACT__WORKERS"] = str(args.workers)
+
+    results = {}
+    for name, parallel in (("serial", False), ("parallel", True)):
+        runs = [run_load(args, parallel) for _ in range(args.repeat)]
+        results[name] = min(runs, key=lambda run: run["wall_s"])
+        print(
+            f"{name:>8}: {results[name]['rows']} rows in {results[name]['wall_s']:.2f}s "
+            f"(cpu {results[name]['cpu_s']:.2f}s, {results[name]['rows_per_s']:.0f} rows/s)"
+        )
+
+    if results["serial"]["rows"] != results["parallel"]["rows"]:
+        print("WARNING: the loaders returned a different number of rows")
+    speed_up = results["serial"]["wall_s"] / results["parallel"]["wall_s"]
+    print(f"speed-up with {args.workers} workers: {speed_up:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Micro-benchmarks of `convert_arrow_columns` against the former per-value conversion.
+
+Builds pymongoarrow tables with ObjectId, Decimal128, binary and code columns, checks
+that both conversions give the same values and reports the time per column type:
+
+    python benchmarks/convert_arrow_columns.py --rows 1000000
+"""
+
+import argparse
+import os
+import random
+import timeit
+from decimal import Decimal
+from typing import Any, Callable, Dict
+
+import pyarrow
+from bson import Decimal128, ObjectId
+from pymongoarrow.types import (  # type: ignore
+    BinaryType,
+    CodeType,
+    Decimal128Type,
+    ObjectIdType,
+    _is_binary,
+    _is_code,
+    _is_decimal128,
+    _is_objectid,
+)
+
+from dagster_mdb_analytics.mongodb.helpers import convert_arrow_columns
+
+
+def convert_arrow_columns_per_value(table: Any) -> Any:
+    """The former implementation, converting one value at a time."""
+    for i, field in enumerate(table.schema):
+        if _is_objectid(field.type) or _is_decimal128(field.type):
+            col_values = [str(value) for value in table[field.name]]
+            table = table.set_column(
+                i,
+                pyarrow.field(field.name, pyarrow.string()),
+                pyarrow.array(col_values, type=pyarrow.string()),
+            )
+        else:
+            type_ = None
+            if _is_binary(field.type):
+                type_ = pyarrow.binary()
+            elif _is_code(field.type):
+                type_ = pyarrow.string()
+
+            if type_:
+                col_values = [value.as_py() for value in table[field.name]]
+                table = table.set_column(
+                    i,
+                    pyarrow.field(field.name, type_),
+                    pyarrow.array(col_values, type=type_),
+                )
+    return table
+
+
+def make_columns(rows: int) -> Dict[str, Any]:
+    """Build one extension array per column type, shaped like `sample_analytics` values."""
+    prices = [
+        Decimal128(Decimal(random.randrange(10**9)) / 10 ** random.randrange(2, 8))
+        for _ in range(rows)
+    ]
+    return {
+        "objectid": pyarrow.ExtensionArray.from_storage(
+            ObjectIdType(),
+            pyarrow.array([ObjectId().binary for _ in range(rows)], pyarrow.binary(12)),
+        ),
+        "decimal128": pyarrow.ExtensionArray.from_storage(
+            Decimal128Type(),
+            pyarrow.array([price.bid for price in prices], pyarrow.binary(16)),
+        ),
+        "binary": pyarrow.ExtensionArray.from_storage(
+            BinaryType(0),
+            pyarrow.array([os.urandom(16) for _ in range(rows)], pyarrow.binary()),
+        ),
+        "code": pyarrow.ExtensionArray.from_storage(
+            CodeType(),
+            pyarrow.array(["function() { return 1; }"] * rows, pyarrow.string()),
+        ),
+    }
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for name, column in make_columns(args.rows).items():
+        table = pyarrow.table({name: column})
+        assert convert_arrow_columns(table).equals(
+            convert_arrow_columns_per_value(table)
+        ), f"conversions of {name} differ"
+
+        per_value = best_of(lambda: convert_arrow_columns_per_value(table), args.repeat)
+        vectorized = best_of(lambda: convert_arrow_columns(table), args.repeat)
+        print(
+            f"{name:>10}: per value {per_value:.3f}s, vectorized {vectorized:.3f}s "
+            f"({per_value / vectorized:.1f}x, {args.rows / vectorized:,.0f} rows/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
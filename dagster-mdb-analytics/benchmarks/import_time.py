@@ -0,0 +1,135 @@
+"""Measure how long the Dagster code location takes to import.
+
+Imports `dagster_mdb_analytics.definitions` in a fresh interpreter with `-X importtime`,
+prints the total and the slowest top-level packages, and exits with 1 when the import
+takes longer than `--budget-s` (`DEFAULT_BUDGET_S` by default) or pulls in a package that
+should only be imported by the assets when they run (the ML and plotting libraries by
+default). Run it in CI after installing the project:
+
+    python benchmarks/import_time.py --repeat 3
+
+`dagster_mdb_analytics_tests/test_import_time.py` checks the same in the test suite.
+The import of the definitions must not connect to MongoDB, so it runs without one: a
+placeholder connection url is set when `SOURCES__MONGODB__CONNECTION_URL` isn't.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+# imported inside the asset functions, never when the definitions load
+FORBIDDEN_PACKAGES = ["prophet", "sklearn", "yellowbrick", "seaborn", "matplotlib"]
+
+# seconds, measured with `-X importtime`, which adds its own overhead (about 4s on a
+# laptop with the pinned requirements)
+DEFAULT_BUDGET_S = 6.0
+
+
+def import_times(module: str) -> Dict[str, float]:
+    """Cumulative import time of each module in seconds, from a fresh interpreter."""
+    # the source is built with the url, never connected to
+    env = {"SOURCES__MONGODB__CONNECTION_URL": "mongodb://localhost", **os.environ}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if completed.returncode:
+        sys.stderr.write(completed.stderr)
+        raise SystemExit(f"importing {module} failed")
+
+    times: Dict[str, float] = {}
+    # import time: self [us] | cumulative | imported package
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:") :].split("|")
+        times[name.strip()] = max(times.get(name.strip(), 0), int(cumulative_us) / 1e6)
+    return times
+
+
+def forbidden_imports(times: Dict[str, float], packages: List[str]) -> List[str]:
+    """The `packages` which were imported, themselves or any of their submodules."""
+    return sorted(
+        package
+        for package in packages
+        if any(name == package or name.startswith(f"{package}.") for name in times)
+    )
+
+
+def slowest_packages(times: Dict[str, float], top: int) -> List[List[Any]]:
+    """The top-level packages that took the longest, submodules counted in their package."""
+    packages: Dict[str, float] = defaultdict(float)
+    for name, cumulative_s in times.items():
+        package = name.split(".")[0]
+        # the cumulative time of a module includes its submodules, keep the outermost
+        packages[package] = max(packages[package], cumulative_s)
+    return [
+        [package, round(seconds, 3)]
+        for package, seconds in sorted(packages.items(), key=lambda item: -item[1])[:top]
+    ]
+
+
+def main() -> Optional[int]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="dagster_mdb_analytics.definitions")
+    parser.add_argument(
+        "--budget-s",
+        type=float,
+        default=DEFAULT_BUDGET_S,
+        help="fail above this import time, 0 to only report it",
+    )
+    parser.add_argument(
+        "--forbid",
+        nargs="*",
+        default=FORBIDDEN_PACKAGES,
+        help="fail when any of these packages is imported",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    # the fastest run, the others paid for cold disk caches
+    runs = [import_times(args.module) for _ in range(args.repeat)]
+    times = min(runs, key=lambda run: run.get(args.module, 0))
+    total_s = times[args.module]
+    forbidden = forbidden_imports(times, args.forbid)
+    slowest = slowest_packages(times, args.top)
+
+    print(f"import {args.module}: {total_s:.3f}s (best of {args.repeat})")
+    for package, seconds in slowest:
+        print(f"  {package:<30} {seconds:>7.3f}s")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "module": args.module,
+                    "python": sys.version.split()[0],
+                    "total_s": round(total_s, 3),
+                    "budget_s": args.budget_s,
+                    "forbidden_imported": forbidden,
+                    "slowest_packages": slowest,
+                },
+                f,
+                indent=2,
+            )
+
+    failed = False
+    if forbidden:
+        print(f"imported at load time: {', '.join(forbidden)}")
+        failed = True
+    if args.budget_s and total_s > args.budget_s:
+        print(f"over the budget of {args.budget_s:.3f}s")
+        failed = True
+    return 1 if failed else None
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Compare the collection loaders across document shapes and chunk sizes.
+
+Loads flat `accounts`, deeply nested `transactions` and mixed-type `customers` documents
+with `CollectionLoader`, `CollectionLoaderParallel`, `CollectionArrowLoader` and
+`CollectionArrowLoaderParallel` and writes the throughput, CPU time and peak RSS of each
+load to a JSON file, to diff between commits:
+
+    python benchmarks/loaders.py --documents 20000 --output loaders.json
+
+Without `--connection-url` the documents are generated by `sample_analytics.py` into an
+in-process mongomock collection (`pip install mongomock`), which serves the raw BSON
+batches of the Arrow loaders from its cursors (`FakeCollection` of the tests). The fake spends far more time per document
+than a server, so only compare its numbers with each other. With `--connection-url` the
+collections of `--database` are read from a `mongod`, e.g. one filled by
+`sample_analytics.py --connection-url ...`.
+
+Each load runs in a fresh process, so the peak RSS is the one of that load only.
+
+Run it as a script from any directory, the project doesn't need to be installed: the
+project root is put on `sys.path`. Not with `python -m benchmarks.loaders`, pymongoarrow
+installs a `benchmarks` package of its own which shadows this directory.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict, Optional
+
+import dlt
+
+# the project root, for `dagster_mdb_analytics` when the project isn't installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dagster_mdb_analytics.mongodb.helpers import (
+    client_from_credentials,
+    collection_documents,
+)
+from dagster_mdb_analytics_tests.fakes import FakeCollection
+from sample_analytics import COLLECTION_SIZES, Generator
+
+# loader class: (parallel, data_item_format)
+LOADERS = {
+    "CollectionLoader": (False, "object"),
+    "CollectionLoaderParallel": (True, "object"),
+    "CollectionArrowLoader": (False, "arrow"),
+    "CollectionArrowLoaderParallel": (True, "arrow"),
+}
+
+
+def fake_collection(shape: str, documents: int, skew: float, seed: int) -> Any:
+    import mongomock
+
+    collection = mongomock.MongoClient(tz_aware=True)["sample_analytics"][shape]
+    generator = Generator(scale=documents / COLLECTION_SIZES[shape], skew=skew, seed=seed)
+    collection.insert_many(generator.documents(shape))
+    return FakeCollection(collection)
+
+
+def peak_rss_mb() -> float:
+    # kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if platform.system() == "Darwin" else 1024)
+
+
+def run_load(
+    loader: str, shape: str, chunk_size: int, args: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Load a collection with one of the loaders, runs in its own process."""
+    # size of the dlt extract pool that runs the deferred batches
+    os.environ["EXTRACT__WORKERS"] = str(args["workers"])
+
+    if args["connection_url"]:
+        client = client_from_credentials(args["connection_url"])
+        collection = client[args["database"]][shape]
+    else:
+        client, collection = None, fake_collection(
+            shape, args["documents"], args["skew"], args["seed"]
+        )
+    rss_before_mb = peak_rss_mb()
+
+    parallel, data_item_format = LOADERS[loader]
+    resource = dlt.resource(collection_documents, name=shape)(
+        client,
+        collection,
+        filter_={},
+        projection=None,
+        pymongoarrow_schema=None,
+        parallel=parallel,
+        chunk_size=chunk_size,
+        data_item_format=data_item_format,
+        batch_strategy=args["batch_strategy"],
+    )
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    # the object loaders yield the documents one by one, the Arrow loaders tables
+    documents = sum(getattr(item, "num_rows", 1) for item in resource)
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+    return {
+        "loader": loader,
+        "shape": shape,
+        "chunk_size": chunk_size,
+        "documents": documents,
+        "wall_s": round(wall, 4),
+        "cpu_s": round(cpu, 4),
+        "documents_per_s": round(documents / wall, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "load_rss_mb": round(peak_rss_mb() - rss_before_mb, 1),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def best_run(loader: str, shape: str, chunk_size: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """The fastest of `--repeat` loads, each in a spawned process."""
+    runs = []
+    for _ in range(args.repeat):
+        with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+            runs.append(executor.submit(run_load, loader, shape, chunk_size, vars(args)).result())
+    return min(runs, key=lambda run: run["wall_s"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connection-url", help="read from a mongod, not the fake")
+    parser.add_argument("--database", default="sample_analytics")
+    parser.add_argument("--documents", type=int, default=20000, help="per fake collection")
+    parser.add_argument(
+        "--shapes", nargs="+", choices=list(COLLECTION_SIZES), default=list(COLLECTION_SIZES)
+    )
+    parser.add_argument("--loaders", nargs="+", choices=list(LOADERS), default=list(LOADERS))
+    parser.add_argument("--chunk-sizes", nargs="+", type=int, default=[1000, 10000])
+    parser.add_argument("--batch-strategy", choices=["skip", "range", "keyset"], default="range")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skew", type=float, default=0.0, help="of the fake documents")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="loaders.json")
+    args = parser.parse_args()
+
+    results = []
+    for shape in args.shapes:
+        for chunk_size in args.chunk_sizes:
+            for loader in args.loaders:
+                result = best_run(loader, shape, chunk_size, args)
+                results.append(result)
+                print(
+                    f"{shape:>12} chunk {chunk_size:>6} {loader:>29}: "
+                    f"{result['documents']} docs in {result['wall_s']:.2f}s "
+                    f"(cpu {result['cpu_s']:.2f}s, {result['documents_per_s']:.0f} docs/s, "
+                    f"peak rss {result['peak_rss_mb']:.0f} MB)"
+                )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "cpu_count": os.cpu_count(),
+                "source": "mongod" if args.connection_url else "mongomock",
+                # the connection url may hold credentials
+                "args": {k: v for k, v in vars(args).items() if k != "connection_url"},
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""Generate `sample_analytics` like collections at any scale.
+
+Produces `accounts`, `customers` and `transactions` documents with the shapes and type
+mix of the Atlas `sample_analytics` dataset: ObjectId keys, nested `transactions` arrays
+of up to 100 transactions with Decimal128 prices and totals, `products` lists and the
+`tier_and_details` maps of the customers. Scale 1 is the size of the dataset (1746
+accounts and transaction buckets, 500 customers, about 88k transactions), scale 120
+gives over 10M transactions without skew.
+
+`--skew` is the exponent of the Zipf distributions the symbols, the products, the
+accounts of a customer and the number of transactions of a bucket are drawn from:
+0 is uniform, 1 and above gives a few hot symbols and a long tail of small buckets.
+
+Insert into a local MongoDB, or write a dump to restore with `mongorestore`:
+
+    python benchmarks/sample_analytics.py --scale 120 --skew 1.2 \
+        --connection-url mongodb://localhost:27017 --drop
+    python benchmarks/sample_analytics.py --scale 120 --output-dir dump
+    mongorestore dump
+
+The documents are generated as a stream, memory doesn't grow with the scale. The same
+seed gives the same documents, ObjectIds included.
+"""
+
+import argparse
+import os
+import random
+import struct
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Sequence, TypeVar
+
+import bson
+from bson import Decimal128, ObjectId
+
+T = TypeVar("T")
+
+# number of documents of each collection at scale 1
+COLLECTION_SIZES = {"accounts": 1746, "customers": 500, "transactions": 1746}
+
+FIRST_ACCOUNT_ID = 100000
+PRODUCTS = [
+    "InvestmentStock",
+    "Derivatives",
+    "Commodity",
+    "CurrencyService",
+    "Brokerage",
+    "InvestmentFund",
+]
+SYMBOLS = ["amzn", "msft", "aapl", "goog", "nvda", "adbe", "crm", "csco", "ibm", "intc"]
+SYMBOLS += ["amd", "sap", "team", "znga", "ebay", "nflx"]
+TIERS = ["Bronze", "Silver", "Gold", "Platinum"]
+BENEFITS = [
+    "24 hour dedicated line",
+    "concierge services",
+    "travel insurance",
+    "airline lounge access",
+    "car rental insurance",
+    "concert tickets",
+    "shopping discounts",
+    "sports tickets",
+]
+TRANSACTIONS_START = datetime(1962, 1, 1, tzinfo=timezone.utc)
+TRANSACTIONS_DAYS = (datetime(2017, 1, 9, tzinfo=timezone.utc) - TRANSACTIONS_START).days
+# documents are stamped from here on, one second apart
+OBJECT_ID_EPOCH = 1483228800
+
+
+class Generator:
+    """Deterministic document factory for a scale, skew and seed."""
+
+    def __init__(self, scale: float = 1.0, skew: float = 0.0, seed: int = 0) -> None:
+        self.scale = scale
+        self.skew = skew
+        self.seed = seed
+        self.accounts = self.count("accounts")
+
+    def count(self, collection: str) -> int:
+        """The number of documents of a collection at this scale."""
+        return max(1, round(COLLECTION_SIZES[collection] * self.scale))
+
+    def documents(self, collection: str) -> Iterator[Dict[str, Any]]:
+        """Generate the documents of a collection."""
+        make_document: Callable[[random.Random, int], Dict[str, Any]] = getattr(
+            self, f"{collection}_document"
+        )
+        # a generator per collection, so each one is the same whichever is generated
+        rng = random.Random(f"{self.seed}:{collection}")
+        for i in range(self.count(collection)):
+            yield make_document(rng, i)
+
+    def accounts_document(self, rng: random.Random, i: int) -> Dict[str, Any]:
+        return {
+            "_id": self._object_id(rng, i),
+            "account_id": FIRST_ACCOUNT_ID + i,
+            "limit": rng.choice([3000, 5000, 10000]),
+            "products": self._sample(rng, PRODUCTS, self._zipf(rng, 1, 5)),
+        }
+
+    def transactions_document(self, rng: random.Random, i: int) -> Dict[str, Any]:
+        transactions = []
+        for _ in range(self._zipf(rng, 1, 100)):
+            amount = rng.randint(1, 10000)
+            price = Decimal(rng.randint(1, 200000)) / 100
+            transactions.append(
+                {
+                    "date": TRANSACTIONS_START
+                    + timedelta(days=rng.randrange(TRANSACTIONS_DAYS)),
+                    "amount": amount,
+                    "transaction_code": rng.choice(["buy", "sell"]),
+                    "symbol": self._choice(rng, SYMBOLS),
+                    "price": Decimal128(price),
+                    "total": Decimal128(price * amount),
+                }
+            )
+        transactions.sort(key=lambda transaction: transaction["date"])
+        return {
+            "_id": self._object_id(rng, i),
+            "account_id": FIRST_ACCOUNT_ID + i % self.accounts,
+            "transaction_count": len(transactions),
+            "bucket_start_date": transactions[0]["date"],
+            "bucket_end_date": transactions[-1]["date"],
+            "transactions": transactions,
+        }
+
+    def customers_document(self, rng: random.Random, i: int) -> Dict[str, Any]:
+        document: Dict[str, Any] = {
+            "_id": self._object_id(rng, i),
+            "username": f"customer{i}",
+            "name": f"Customer {i}",
+            "address": f"{rng.randint(1, 9999)} Main Street, Springfield",
+            "birthdate": datetime(1940, 1, 1, tzinfo=timezone.utc)
+            + timedelta(days=rng.randrange(22000)),
+            "email": f"customer{i}@example.com",
+            "accounts": [
+                FIRST_ACCOUNT_ID + rng.randrange(self.accounts)
+                for _ in range(self._zipf(rng, 1, 6))
+            ],
+            "tier_and_details": {},
+        }
+        for _ in range(rng.randint(0, 3)):
+            tier_id = format(rng.getrandbits(128), "032x")
+            document["tier_and_details"][tier_id] = {
+                "tier": rng.choice(TIERS),
+                "id": tier_id,
+                "active": True,
+                "benefits": self._sample(rng, BENEFITS, rng.randint(1, 3)),
+            }
+        # like the dataset, a few customers are flagged with a field the others lack
+        if rng.random() < 0.1:
+            document["active"] = rng.choice([True, False])
+        return document
+
+    def _object_id(self, rng: random.Random, i: int) -> ObjectId:
+        return ObjectId(
+            struct.pack(">I", OBJECT_ID_EPOCH + i) + rng.getrandbits(64).to_bytes(8, "big")
+        )
+
+    def _zipf(self, rng: random.Random, low: int, high: int) -> int:
+        """A value of `low..high`, the low ones more frequent with skew."""
+        return rng.choices(range(low, high + 1), zipf_weights(high - low + 1, self.skew))[0]
+
+    def _choice(self, rng: random.Random, population: Sequence[T]) -> T:
+        return rng.choices(population, zipf_weights(len(population), self.skew))[0]
+
+    def _sample(self, rng: random.Random, population: Sequence[T], k: int) -> List[T]:
+        sample: List[T] = []
+        while len(sample) < k:
+            item = self._choice(rng, population)
+            if item not in sample:
+                sample.append(item)
+        return sample
+
+
+@lru_cache(maxsize=None)
+def zipf_weights(n: int, skew: float) -> List[float]:
+    return [1 / (rank + 1) ** skew for rank in range(n)]
+
+
+def batched(documents: Iterator[T], size: int) -> Iterator[List[T]]:
+    while batch := list(islice(documents, size)):
+        yield batch
+
+
+def insert(generator: Generator, args: argparse.Namespace, collection: str) -> None:
+    from pymongo import MongoClient
+
+    target = MongoClient(args.connection_url)[args.database][collection]
+    if args.drop:
+        target.drop()
+    for batch in batched(generator.documents(collection), args.batch_size):
+        target.insert_many(batch, ordered=False)
+
+
+def dump(generator: Generator, args: argparse.Namespace, collection: str) -> None:
+    # the layout of mongodump, `mongorestore <output-dir>` restores the database
+    database_dir = os.path.join(args.output_dir, args.database)
+    os.makedirs(database_dir, exist_ok=True)
+    with open(os.path.join(database_dir, f"{collection}.bson"), "wb") as f:
+        for batch in batched(generator.documents(collection), args.batch_size):
+            f.write(b"".join(bson.encode(document) for document in batch))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--skew", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--collections",
+        nargs="+",
+        choices=list(COLLECTION_SIZES),
+        default=list(COLLECTION_SIZES),
+    )
+    parser.add_argument("--database", default="sample_analytics")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--connection-url", help="insert into this MongoDB")
+    target.add_argument("--output-dir", help="write BSON dump files here")
+    parser.add_argument("--drop", action="store_true", help="drop the collections first")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    generator = Generator(scale=args.scale, skew=args.skew, seed=args.seed)
+    write = insert if args.connection_url else dump
+    for collection in args.collections:
+        start = time.perf_counter()
+        write(generator, args, collection)
+        print(
+            f"{collection}: {generator.count(collection)} documents "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,7 @@
 from dagster import asset, Config
-from dagster_snowflake import SnowflakeResource
+from ..resources import SnowflakeQueryResource
 
 import pandas as pd
-import matplotlib.pyplot as plt
-
-from prophet import Prophet  
 
 class AdhocConfig(Config):
     filename: str
@@ -13,10 +10,12 @@ class AdhocConfig(Config):
 @asset(
     deps=['dlt_mongodb_transactions']
 )
-def adhoc_daily_transaction_forecast(config: AdhocConfig, snowflake: SnowflakeResource) -> None:
+def adhoc_daily_transaction_forecast(config: AdhocConfig, snowflake: SnowflakeQueryResource) -> None:
     """
     Adhoc time series forecast: Predict daily transaction volume using Prophet
     """
+    import matplotlib.pyplot as plt
+    from prophet import Prophet
 
     query = """
         SELECT 
@@ -27,8 +26,7 @@ def adhoc_daily_transaction_forecast(config: AdhocConfig, snowflake: SnowflakeRe
         ORDER BY ds
     """
 
-    with snowflake.get_connection() as conn:
-        df = pd.read_sql(query, conn)
+    df = snowflake.fetch_frame(query)
 
     df.columns = df.columns.str.lower()
 
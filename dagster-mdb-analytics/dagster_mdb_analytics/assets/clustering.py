@@ -1,20 +1,14 @@
-from dagster_snowflake import SnowflakeResource
+from ..resources import SnowflakeQueryResource
 from dagster import asset, AutoMaterializePolicy
 from ..partitions import monthly_partition
 
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.ticker import FuncFormatter
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
-from yellowbrick.cluster import KElbowVisualizer
 
 # ===== DATA PREPARATION ===== #
 
 @asset(deps=['dlt_mongodb_accounts', 'dlt_mongodb_transactions'])
-def account_transaction_features(snowflake: SnowflakeResource) -> pd.DataFrame:
+def account_transaction_features(snowflake: SnowflakeQueryResource) -> pd.DataFrame:
     """
     Join accounts and transactions to prepare training data for clustering tasks
     """
@@ -48,8 +42,7 @@ def account_transaction_features(snowflake: SnowflakeResource) -> pd.DataFrame:
         LEFT JOIN transaction_agg t ON a.ACCOUNT_ID = t.ACCOUNT_ID
     """
 
-    with snowflake.get_connection() as conn:
-        df = pd.read_sql(query, conn)
+    df = snowflake.fetch_frame(query)
 
     df.fillna(0, inplace=True)  # fill missing values with 0
     df.to_csv('data_clustering_task/account_transaction_features.csv', index=False)
@@ -61,6 +54,8 @@ def standardized_features() -> pd.DataFrame:
     """
     Perform feature scaling on the extracted features to prepare for clustering.
     """
+    from sklearn.preprocessing import StandardScaler
+
     df = pd.read_csv('data_clustering_task/account_transaction_features.csv')
 
     features = ['CREDIT_LIMIT', 'NUM_TRANSACTIONS', 'TOTAL_VOLUME', 'TOTAL_VALUE', 'AVG_PRICE']
@@ -79,6 +74,9 @@ def elbow_chart():
     """
     Use Yellowbrick's KElbowVisualizer to determine the optimal number of clusters
     """
+    from sklearn.cluster import KMeans
+    from yellowbrick.cluster import KElbowVisualizer
+
     df = pd.read_csv('data_clustering_task/standardized_features.csv')
     X = df.drop(columns=['ACCOUNT_ID'])
 
@@ -95,6 +93,8 @@ def account_transaction_clusters() -> pd.DataFrame:
     """
     Apply KMeans clustering on standardized features to segment accounts into distinct groups.
     """
+    from sklearn.cluster import KMeans
+
     df = pd.read_csv('data_clustering_task/standardized_features.csv')
     X = df.drop(columns=['ACCOUNT_ID'])
 
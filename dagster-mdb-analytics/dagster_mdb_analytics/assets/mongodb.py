@@ -1,30 +1,145 @@
-from dagster import AssetExecutionContext
+import os
+import shutil
+from typing import Any, Dict, Iterator, List, Optional
+
+from dagster import AssetExecutionContext, AssetsDefinition, MaterializeResult
 from dagster_embedded_elt.dlt import DagsterDltResource, dlt_assets
 
 import dlt
+from dlt.common.pipeline import get_dlt_pipelines_dir
 from ..mongodb import mongodb, mongodb_collection
-# from pymongoarrow.schema import Schema 
+from ..partitions import monthly_partition
+# from pymongoarrow.schema import Schema
 
 # arrow_schema = Schema({})
 
-analytics = mongodb(
-    database='sample_analytics',
-    # pymongoarrow_schema=arrow_schema
-).with_resources(
+MONGODB_COLLECTIONS = [
     "accounts",
     # "customers",
-    "transactions"
-)
+    "transactions",
+]
+
+# collections loaded in a window of this field per month of `monthly_partition`, the
+# others are loaded whole
+MONGODB_PARTITION_CURSORS = {
+    "transactions": "bucket_start_date",
+}
+
+
+def mongodb_collection_assets(
+    collections: List[str],
+    database: str,
+    partition_cursors: Optional[Dict[str, str]] = None,
+    **source_kwargs: Any,
+) -> List[AssetsDefinition]:
+    """
+    One dlt asset per collection, each loaded by a pipeline of its own (so its own working
+    directory and state). The collections materialize in separate steps: at the same time
+    under the multiprocess executor, see `mongodb_job`, and a failed one is retried alone.
+
+    The collections of `partition_cursors` are partitioned by `monthly_partition`, a
+    partition loads the documents with the cursor field in its month, see
+    `mongodb_monthly_job`.
+    """
+    return [
+        mongodb_collection_asset(
+            collection,
+            database,
+            (partition_cursors or {}).get(collection),
+            source_kwargs,
+        )
+        for collection in collections
+    ]
+
 
-@dlt_assets(
-    dlt_source=analytics,
-    dlt_pipeline=dlt.pipeline(
-        pipeline_name="local_mongo",
-        destination='snowflake',
+def mongodb_collection_asset(
+    collection: str,
+    database: str,
+    cursor_field: Optional[str],
+    source_kwargs: Dict[str, Any],
+) -> AssetsDefinition:
+    @dlt_assets(
+        dlt_source=mongodb(
+            database=database,
+            # listed so the code location doesn't connect to MongoDB to build the source
+            collection_names=[collection],
+            **source_kwargs,
+        ),
+        dlt_pipeline=dlt.pipeline(
+            pipeline_name=f"local_mongo_{collection}",
+            destination='snowflake',
+            dataset_name="analytics",
+        ),
+        name=f"mongodb_{collection}",
+        group_name="mongodb",
+        partitions_def=monthly_partition if cursor_field else None,
+    )
+    def dlt_asset_factory(context: AssetExecutionContext, dlt: DagsterDltResource):
+        if cursor_field:
+            yield from run_partition(
+                context, dlt, collection, cursor_field, database, source_kwargs
+            )
+        else:
+            yield from dlt.run(context=context, write_disposition="merge")
+
+    return dlt_asset_factory
+
+
+def run_partition(
+    context: AssetExecutionContext,
+    dlt_resource: DagsterDltResource,
+    collection: str,
+    cursor_field: str,
+    database: str,
+    source_kwargs: Dict[str, Any],
+) -> Iterator[MaterializeResult]:
+    """
+    Load the documents of a collection with `cursor_field` in the month of the partition.
+
+    The window has an end, so it leaves the incremental state alone: the months load in
+    any order and one can be loaded again without touching the others, merged on `_id`.
+    The runs of a backfill load several months at the same time, so each month has a
+    pipeline directory of its own (where the Parquet files are staged) and a staging
+    dataset of its own, `analytics_staging_<yyyy>_<mm>`, for the merge. The directory is
+    kept until the month is loaded, so a retry of a failed run resumes from its
+    checkpoint (see the `checkpoint` option of the source).
+    """
+    window = context.partition_time_window
+    month = window.start.strftime("%Y_%m")
+    source = mongodb(
+        database=database,
+        collection_names=[collection],
+        incremental=dlt.sources.incremental(
+            cursor_field, initial_value=window.start, end_value=window.end
+        ),
+        **source_kwargs,
+    )
+    pipelines_dir = os.path.join(
+        get_dlt_pipelines_dir(), "partitions", f"{collection}_{month}"
+    )
+    pipeline = dlt.pipeline(
+        pipeline_name=f"local_mongo_{collection}",
+        pipelines_dir=pipelines_dir,
+        destination=dlt.destinations.snowflake(
+            staging_dataset_name_layout=f"%s_staging_{month}"
+        ),
         dataset_name="analytics",
-    ),
-    name="mongodb",
-    group_name="mongodb",
+    )
+    yield from dlt_resource.run(
+        context=context,
+        dlt_source=source,
+        dlt_pipeline=pipeline,
+        write_disposition="merge",
+    )
+    # only reached once the load succeeded
+    shutil.rmtree(pipelines_dir, ignore_errors=True)
+
+
+mongodb_assets = mongodb_collection_assets(
+    MONGODB_COLLECTIONS,
+    database='sample_analytics',
+    partition_cursors=MONGODB_PARTITION_CURSORS,
+    chunk_bytes=32 * 1024 * 1024, # transactions documents hold up to 100 nested transactions
+    explain=True, # query plans end up in the asset metadata, see MongoDbDltResource
+    # pymongoarrow_schema=arrow_schema
 )
-def dlt_asset_factory(context: AssetExecutionContext, dlt: DagsterDltResource):
-    yield from dlt.run(context=context, write_disposition="merge")
\ No newline at end of file
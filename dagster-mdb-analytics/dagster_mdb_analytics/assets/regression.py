@@ -1,20 +1,13 @@
-from dagster_snowflake import SnowflakeResource
+from ..resources import SnowflakeQueryResource
 from dagster import asset, AutoMaterializePolicy
 from ..partitions import monthly_partition
 
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.ticker import FuncFormatter
-
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, r2_score
 
 # ===== DATA PREPARATION ===== #
 @asset(deps=['dlt_mongodb_transactions'])
-def transaction_features_for_regression(snowflake: SnowflakeResource) -> pd.DataFrame:
+def transaction_features_for_regression(snowflake: SnowflakeQueryResource) -> pd.DataFrame:
     """
     Extract relevant features from transactions for regression task.
     """
@@ -30,8 +23,7 @@ def transaction_features_for_regression(snowflake: SnowflakeResource) -> pd.Data
         INNER JOIN DAGSTER_DB.ANALYTICS.TRANSACTIONS__TRANSACTIONS tt ON t._DLT_ID = tt._DLT_PARENT_ID
     """
 
-    with snowflake.get_connection() as conn:
-        df = pd.read_sql(query, conn)
+    df = snowflake.fetch_frame(query)
 
     df['TYPE'] = df['TYPE'].str.lower()
     df = df[df['TYPE'].isin(['buy', 'sell'])]
@@ -45,6 +37,12 @@ def regression_model_per_type() -> None:
     """
     Train a linear regression model separately for each transaction type: 'buy' and 'sell'.
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from sklearn.linear_model import LinearRegression
+    from sklearn.metrics import mean_squared_error, r2_score
+    from sklearn.model_selection import train_test_split
+
     df = pd.read_csv('data_regression_task/transaction_features.csv')
     results = []
 
@@ -92,6 +90,11 @@ def regression_model_per_type_post_2015() -> None:
     Train a linear regression model separately for each transaction type ('buy' and 'sell') 
     using data up to 2015, then predict on later data.
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from sklearn.linear_model import LinearRegression
+    from sklearn.metrics import mean_squared_error, r2_score
+
     df = pd.read_csv('data_regression_task/transaction_features.csv')
     df['TRANSACTION_DATE'] = pd.to_datetime(df['TRANSACTION_DATE'])
 
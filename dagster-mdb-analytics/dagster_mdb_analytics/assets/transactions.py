@@ -1,34 +1,45 @@
-from dagster_snowflake import SnowflakeResource
-from dagster import asset, AutoMaterializePolicy
+from ..resources import SnowflakeQueryResource
+from dagster import asset, AutoMaterializePolicy, Config
 from ..partitions import monthly_partition
 
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.ticker import FuncFormatter
 
-@asset(
-    deps=["dlt_mongodb_transactions"]
-)
-def cleaned_transactions(snowflake: SnowflakeResource) -> pd.DataFrame:
-    query = """
-        SELECT
-            ACCOUNT_ID,
-            DATE::DATE AS TRANSACTION_DATE,
-            TRANSACTION_CODE AS TYPE,
-            SYMBOL AS STOCK,
-            AMOUNT::INT AS VOLUME,
-            PRICE::FLOAT AS UNIT_PRICE,
-            TOTAL::FLOAT AS TOTAL_VALUE
-        FROM DAGSTER_DB.ANALYTICS.TRANSACTIONS t
-        INNER JOIN DAGSTER_DB.ANALYTICS.TRANSACTIONS__TRANSACTIONS tt ON t._DLT_ID = tt._DLT_PARENT_ID 
-    """
-
-    with snowflake.get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query)
-        df = cursor.fetch_pandas_all()
+CLEANED_TRANSACTIONS_QUERY = """
+    SELECT
+        ACCOUNT_ID,
+        DATE::DATE AS TRANSACTION_DATE,
+        TRANSACTION_CODE AS TYPE,
+        SYMBOL AS STOCK,
+        AMOUNT::INT AS VOLUME,
+        PRICE::FLOAT AS UNIT_PRICE,
+        TOTAL::FLOAT AS TOTAL_VALUE
+    FROM DAGSTER_DB.ANALYTICS.TRANSACTIONS t
+    INNER JOIN DAGSTER_DB.ANALYTICS.TRANSACTIONS__TRANSACTIONS tt ON t._DLT_ID = tt._DLT_PARENT_ID 
+"""
+
+# the cleaning and the groupby of the pandas path, run in Snowflake
+STOCK_TRANSACTION_SUMMARY_QUERY = f"""
+    SELECT
+        TRANSACTION_DATE,
+        STOCK,
+        LOWER(TYPE) AS TYPE,
+        SUM(VOLUME) AS "total_volume",
+        SUM(TOTAL_VALUE) AS "total_value",
+        AVG(UNIT_PRICE) AS "avg_price",
+        COUNT(STOCK) AS "transactions"
+    FROM ({CLEANED_TRANSACTIONS_QUERY})
+    WHERE VOLUME > 0
+        AND TRANSACTION_DATE IS NOT NULL AND STOCK IS NOT NULL AND TYPE IS NOT NULL
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+"""
+
+class TransactionSummaryConfig(Config):
+    pushdown: bool = True # aggregate in Snowflake and fetch the summary rows only, False groups every cleaned row in pandas
+
+def fetch_cleaned_transactions(snowflake: SnowflakeQueryResource) -> pd.DataFrame:
+    df = snowflake.fetch_frame(CLEANED_TRANSACTIONS_QUERY)
 
     # Optionally clean/filter
     df = df[df["VOLUME"] > 0]  # exclude transactions <= 0 volume 
@@ -36,18 +47,33 @@ def cleaned_transactions(snowflake: SnowflakeResource) -> pd.DataFrame:
 
     return df
 
-@asset
-def stock_transaction_summary_by_date(cleaned_transactions: pd.DataFrame) -> pd.DataFrame:
-    summary = (
-        cleaned_transactions
-        .groupby(["TRANSACTION_DATE", "STOCK", "TYPE"], as_index=False)
-        .agg(
-            total_volume=("VOLUME", "sum"),
-            total_value=("TOTAL_VALUE", "sum"),
-            avg_price=("UNIT_PRICE", "mean"),
-            transactions=("STOCK", "count")
+@asset(
+    deps=["dlt_mongodb_transactions"]
+)
+def cleaned_transactions(snowflake: SnowflakeQueryResource) -> pd.DataFrame:
+    return fetch_cleaned_transactions(snowflake)
+
+@asset(
+    deps=["dlt_mongodb_transactions"]
+)
+def stock_transaction_summary_by_date(config: TransactionSummaryConfig, snowflake: SnowflakeQueryResource) -> pd.DataFrame:
+    """
+    Volume, value, average price and number of transactions per date, stock and type.
+    Computed in Snowflake unless `pushdown` is off, then from the cleaned rows in pandas.
+    """
+    if config.pushdown:
+        summary = snowflake.fetch_frame(STOCK_TRANSACTION_SUMMARY_QUERY)
+    else:
+        summary = (
+            fetch_cleaned_transactions(snowflake)
+            .groupby(["TRANSACTION_DATE", "STOCK", "TYPE"], as_index=False, observed=True)
+            .agg(
+                total_volume=("VOLUME", "sum"),
+                total_value=("TOTAL_VALUE", "sum"),
+                avg_price=("UNIT_PRICE", "mean"),
+                transactions=("STOCK", "count")
+            )
         )
-    )
     summary.to_csv('data/stock_transaction_summary_by_date.csv', index=False)
 
     return summary
@@ -60,6 +86,9 @@ def top_selling_stocks_by_transaction_volume():
     """
     Generate a bar chart based on top 10 stocks by transaction volume
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     stock_summary = pd.read_csv('data/stock_transaction_summary_by_date.csv')
     top_selling_10_stocks = stock_summary[stock_summary['TYPE'] == 'sell'].groupby(by='STOCK').agg(TOTAL_VOLUME=('total_volume', 'sum')).sort_values(by='TOTAL_VOLUME', ascending=False).head(10)
 
@@ -99,6 +128,9 @@ def top_buying_stocks_by_transaction_volume():
     """
     Generate a bar chart based on top 10 stocks by transaction volume
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     stock_summary = pd.read_csv('data/stock_transaction_summary_by_date.csv')
     top_buying_10_stocks = stock_summary[stock_summary['TYPE'] == 'buy'].groupby(by='STOCK').agg(TOTAL_VOLUME=('total_volume', 'sum')).sort_values(by='TOTAL_VOLUME', ascending=False).head(10)
 
@@ -133,7 +165,7 @@ def top_buying_stocks_by_transaction_volume():
 # ============================== #
 
 @asset(deps=["dlt_mongodb_accounts"])
-def accounts_flattened_products(snowflake: SnowflakeResource) -> pd.DataFrame:
+def accounts_flattened_products(snowflake: SnowflakeQueryResource) -> pd.DataFrame:
     """
     Flattened version of accounts and their associated products from MongoDB into one row per product per account.
     Useful for granular analysis of which product types are linked to which accounts.
@@ -147,8 +179,7 @@ def accounts_flattened_products(snowflake: SnowflakeResource) -> pd.DataFrame:
         INNER JOIN DAGSTER_DB.ANALYTICS.ACCOUNTS__PRODUCTS ap 
             ON a._DLT_ID = ap._DLT_PARENT_ID
     """
-    with snowflake.get_connection() as conn: #trying another way to connect to Snowflake
-        df = pd.read_sql(query, conn)
+    df = snowflake.fetch_frame(query, compact=True)
 
     df['PRODUCT'] = df['PRODUCT'].str.strip()
     return df
@@ -161,7 +192,7 @@ def product_distribution(accounts_flattened_products: pd.DataFrame) -> pd.DataFr
     """    
     product_counts = (
         accounts_flattened_products
-        .groupby("PRODUCT")
+        .groupby("PRODUCT", observed=True)
         .agg(num_accounts=("ACCOUNT_ID", "nunique"))
         .sort_values("num_accounts", ascending=False)
         .reset_index()
@@ -177,7 +208,7 @@ def average_limit_by_product(accounts_flattened_products: pd.DataFrame) -> pd.Da
     """    
     result = (
         accounts_flattened_products
-        .groupby("PRODUCT", as_index=False)
+        .groupby("PRODUCT", as_index=False, observed=True)
         .agg(
             avg_credit_limit=("CREDIT_LIMIT", "mean"),
             min_limit=("CREDIT_LIMIT", "min"),
@@ -194,6 +225,9 @@ def top_products_chart():
     Generate a bar chart of the top 10 most common products by number of accounts.
     Uses the CSV exported by `product_distribution` and saves the chart as a PNG.
     """    
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     df = pd.read_csv("data/product_distribution.csv")
     top = df.sort_values("num_accounts", ascending=False).head(10)
 
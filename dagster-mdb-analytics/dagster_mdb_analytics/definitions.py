@@ -3,7 +3,7 @@ from dagster import Definitions, load_assets_from_modules
 from .assets import mongodb, transactions, clustering, regression, adhoc
 from .partitions import monthly_partition
 from .resources import snowflake_resource, dlt_resource
-from .jobs import transactions_job, adhoc_job
+from .jobs import transactions_job, adhoc_job, mongodb_job, mongodb_monthly_job
 from .schedules import monthly_schedule
 from .sensors import adhoc_sensor
 
@@ -25,7 +25,7 @@ defs = Definitions(
         "dlt": dlt_resource,
         "snowflake": snowflake_resource
     },
-    jobs=[transactions_job, adhoc_job],
+    jobs=[transactions_job, adhoc_job, mongodb_job, mongodb_monthly_job],
     schedules=[monthly_schedule],
     sensors=[adhoc_sensor]
 )
\ No newline at end of file
@@ -1,4 +1,5 @@
-from dagster import AssetSelection, define_asset_job
+from dagster import AssetSelection, define_asset_job, multiprocess_executor
+from ..assets.mongodb import mongodb_assets
 from ..partitions import monthly_partition
 
 # https://docs.dagster.io/api/dagster/assets
@@ -11,4 +12,24 @@ transactions_job = define_asset_job(
 adhoc_job = define_asset_job(
     name="adhoc_job",
     selection=AssetSelection.assets(["adhoc_daily_transaction_forecast"])
-)
\ No newline at end of file
+)
+
+mongodb_monthly_assets = AssetSelection.assets(
+    *[asset for asset in mongodb_assets if asset.partitions_def is not None]
+)
+
+# the collections loaded whole, in a process each, at most `max_concurrent` at a time
+# (the default run config, change it in the launchpad)
+mongodb_job = define_asset_job(
+    name="mongodb_job",
+    selection=AssetSelection.groups("mongodb") - mongodb_monthly_assets,
+    executor_def=multiprocess_executor,
+    config={"execution": {"config": {"max_concurrent": 2}}},
+)
+
+# the collections loaded by month, in a run per partition (backfill several months to
+# load them at the same time), which doesn't load the other collections again
+mongodb_monthly_job = define_asset_job(
+    name="mongodb_monthly_job",
+    selection=mongodb_monthly_assets,
+)
@@ -3,15 +3,19 @@
 from typing import Any, Dict, Iterable, List, Optional, Union, Mapping
 
 import dlt
-from dlt.common.data_writers import TDataItemFormat
 from dlt.sources import DltResource
 from dlt.common.configuration.specs.config_section_context import ConfigSectionContext
 
 from .helpers import (
+    MongoDbChangeStreamResourceConfiguration,
     MongoDbCollectionConfiguration,
     MongoDbCollectionResourceConfiguration,
+    TBatchStrategy,
+    TLoaderStrategy,
+    TMongoDataItemFormat,
     client_from_credentials,
-    collection_documents,
+    collection_changes,
+    database_collection_documents,
 )
 
 
@@ -23,6 +27,17 @@ def mongodb(
     incremental: Optional[dlt.sources.incremental] = None,  # type: ignore[type-arg]
     write_disposition: Optional[str] = dlt.config.value,
     parallel: Optional[bool] = dlt.config.value,
+    batch_strategy: Optional[TBatchStrategy] = "skip",
+    concurrent: Optional[bool] = False,
+    decode_processes: Optional[int] = 0,
+    decode_queue_depth: Optional[int] = None,
+    chunk_bytes: Optional[int] = None,
+    pipeline: Optional[List[Dict[str, Any]]] = None,
+    explain: Optional[bool] = False,
+    skip_unindexed_sort: Optional[bool] = False,
+    loader_strategy: Optional[TLoaderStrategy] = "manual",
+    checkpoint: Optional[bool] = False,
+    data_item_format: Optional[TMongoDataItemFormat] = "object",
     limit: Optional[int] = None,
     filter_: Optional[Dict[str, Any]] = None,
     projection: Optional[Union[Mapping[str, Any], Iterable[str]]] = None,
@@ -40,6 +55,58 @@ def mongodb(
             E.g., `incremental=dlt.sources.incremental('updated_at', pendulum.parse('2022-01-01T00:00:00Z'))`
         write_disposition (str): Write disposition of the resource.
         parallel (Optional[bool]): Option to enable parallel loading for the collection. Default is False.
+            Batches are loaded on the dlt extract thread pool, sized by `workers` in the `[extract]` config section.
+        batch_strategy (Optional[TBatchStrategy]): How parallel loading splits a collection into batches.
+            Supported strategies:
+                skip - `skip`/`limit` windows over a single query. Default.
+                range - indexed `$gte`/`$lt` ranges of `_id` (or the incremental cursor field),
+                    with boundaries picked from a random sample of the collection.
+                keyset - the same ranges, each bounded by walking `chunk_size` index entries while the
+                    earlier batches load, so no document count is needed before the first batch.
+        concurrent (Optional[bool]): Option to extract the collections at the same time on the dlt extract
+            thread pool instead of one after another. Each collection keeps its own chunking and incremental
+            state. The number of batches in flight across all collections is capped by `max_parallel_items`
+            in the `[extract]` config section. Default is False.
+        decode_processes (Optional[int]): The number of worker processes decoding and converting the BSON
+            documents of the object format, so the conversion isn't bound to a single core. The documents
+            are fetched by one cursor, `parallel` is ignored. Default is 0, decoding in this process.
+        decode_queue_depth (Optional[int]): The number of batches handed to the decoding processes ahead of
+            the one being extracted, caps the memory held by the pool. Default is twice `decode_processes`.
+        chunk_bytes (Optional[int]): The maximum size of a batch in bytes of BSON, e.g. `32 * 1024 * 1024`. The
+            number of documents of a batch is fitted to it from the average document size in the collection
+            stats, with `chunk_size` as the maximum. The batches are also split at document boundaries so
+            none goes over it. Default is None, batches of `chunk_size` documents.
+        pipeline (Optional[List[Dict[str, Any]]]): Aggregation stages (`$unwind`, `$project`, `$addFields`, ...)
+            to run on the server in place of `find()`, e.g. to land a flat table from nested arrays. They run
+            after the filter, the incremental window, the parallel batch bounds and the projection, which are
+            still applied to the documents of the collection. The output needs a unique `_id` (the primary key)
+            and, with `incremental`, the cursor field.
+        explain (Optional[bool]): Explain the query of each collection before loading it. The plan, i.e. the scan
+            (IXSCAN or COLLSCAN), the index, whether the server sorts in memory and the estimated number of
+            documents examined, is logged and stored in the resource state under `query_plan`. Default is False.
+        skip_unindexed_sort (Optional[bool]): Drop the server-side sort on the incremental cursor field when no
+            index provides it, instead of a blocking in-memory sort. The incremental window is pushed down to the
+            filter, so the rows don't need to come in order; the sort is kept when `limit` is set. Default is False.
+        loader_strategy (Optional[TLoaderStrategy]): How the loader of each collection is picked.
+            Supported strategies:
+                manual - from `parallel`, `batch_strategy`, `data_item_format` and `chunk_size`. Default.
+                auto - from the collection stats, its indexes and a sample of its documents: range-parallel
+                    for large collections with an indexed split field, Arrow for flat documents and a chunk
+                    size fitted to the average document size. The choice is logged and replaces those
+                    arguments, set any of them in the `[sources.mongodb.loader.<collection>]` config section
+                    to override it.
+        checkpoint (Optional[bool]): Make a failed load of a large collection resume instead of starting over.
+            The documents are read in `_id` order into Parquet files (`data_item_format` 'arrow' becomes
+            'parquet'), each finished file is recorded with its last `_id`, and a run following a failed
+            extract keeps those files and continues after that `_id`. Needs 'arrow' or 'parquet' and is
+            ignored with `incremental` or `pipeline`. Default is False.
+        data_item_format (Optional[TMongoDataItemFormat]): The data format to use for loading.
+            Supported formats:
+                object - Python objects (dicts, lists).
+                arrow - Apache Arrow tables.
+                parquet - Parquet files streamed from the raw BSON batches in row groups of `chunk_size`
+                    documents and imported into the load package as they are. Needs a fixed schema, the
+                    `pymongoarrow_schema` is inferred when not given. Not supported with `incremental`.
         limit (Optional[int]):
             The maximum number of documents to load. The limit is
             applied to each requested collection separately.
@@ -51,36 +118,47 @@ def mongodb(
                 exclude (dict) - {"released": False, "runtime": False}
             Note: Can't mix include and exclude statements '{"title": True, "released": False}`
         pymongoarrow_schema (pymongoarrow.schema.Schema): Mapping of expected field types of a collection to convert BSON to Arrow
+            Pass "auto" to infer the schema of each collection from a sample and cache it on disk, it is
+            inferred again when the newest documents have new fields or types.
 
     Returns:
         Iterable[DltResource]: A list of DLT resources for each collection to be loaded.
     """
 
-    # set up mongo client
-    client = client_from_credentials(connection_url)
-    if not database:
-        mongo_database = client.get_default_database()
-    else:
-        mongo_database = client[database]
-
-    # use provided collection or all conllections
+    # use provided collection or all conllections, the client connects when a collection
+    # is extracted unless the collections are listed here
     if not collection_names:
+        client = client_from_credentials(connection_url)
+        if not database:
+            mongo_database = client.get_default_database()
+        else:
+            mongo_database = client[database]
         collection_names = mongo_database.list_collection_names()
 
-    collection_list = [mongo_database[collection] for collection in collection_names]
-
-    for collection in collection_list:
+    for collection_name in collection_names:
         yield dlt.resource(  # type: ignore
-            collection_documents,
-            name=collection.name,
+            database_collection_documents,
+            name=collection_name,
             primary_key="_id",
             write_disposition=write_disposition,
             spec=MongoDbCollectionConfiguration,
+            parallelized=bool(concurrent),
         )(
-            client,
-            collection,
+            connection_url,
+            database,
+            collection_name,
             incremental=incremental,
             parallel=parallel,
+            batch_strategy=batch_strategy,
+            decode_processes=decode_processes,
+            decode_queue_depth=decode_queue_depth,
+            chunk_bytes=chunk_bytes,
+            pipeline=pipeline,
+            explain=explain,
+            skip_unindexed_sort=skip_unindexed_sort,
+            loader_strategy=loader_strategy,
+            checkpoint=checkpoint,
+            data_item_format=data_item_format,
             limit=limit,
             filter_=filter_ or {},
             projection=projection,
@@ -100,9 +178,18 @@ def mongodb_collection(
     incremental: Optional[dlt.sources.incremental] = None,  # type: ignore[type-arg]
     write_disposition: Optional[str] = dlt.config.value,
     parallel: Optional[bool] = False,
+    batch_strategy: Optional[TBatchStrategy] = "skip",
+    decode_processes: Optional[int] = 0,
+    decode_queue_depth: Optional[int] = None,
+    chunk_bytes: Optional[int] = None,
+    pipeline: Optional[List[Dict[str, Any]]] = None,
+    explain: Optional[bool] = False,
+    skip_unindexed_sort: Optional[bool] = False,
+    loader_strategy: Optional[TLoaderStrategy] = "manual",
+    checkpoint: Optional[bool] = False,
     limit: Optional[int] = None,
     chunk_size: Optional[int] = 10000,
-    data_item_format: Optional[TDataItemFormat] = "object",
+    data_item_format: Optional[TMongoDataItemFormat] = "object",
     filter_: Optional[Dict[str, Any]] = None,
     projection: Optional[Union[Mapping[str, Any], Iterable[str]]] = dlt.config.value,
     pymongoarrow_schema: Optional[Any] = None,
@@ -118,12 +205,56 @@ def mongodb_collection(
             E.g., `incremental=dlt.sources.incremental('updated_at', pendulum.parse('2022-01-01T00:00:00Z'))`
         write_disposition (str): Write disposition of the resource.
         parallel (Optional[bool]): Option to enable parallel loading for the collection. Default is False.
+            Batches are loaded on the dlt extract thread pool, sized by `workers` in the `[extract]` config section.
+        batch_strategy (Optional[TBatchStrategy]): How parallel loading splits a collection into batches.
+            Supported strategies:
+                skip - `skip`/`limit` windows over a single query. Default.
+                range - indexed `$gte`/`$lt` ranges of `_id` (or the incremental cursor field),
+                    with boundaries picked from a random sample of the collection.
+                keyset - the same ranges, each bounded by walking `chunk_size` index entries while the
+                    earlier batches load, so no document count is needed before the first batch.
+        decode_processes (Optional[int]): The number of worker processes decoding and converting the BSON
+            documents of the object format, so the conversion isn't bound to a single core. The documents
+            are fetched by one cursor, `parallel` is ignored. Default is 0, decoding in this process.
+        decode_queue_depth (Optional[int]): The number of batches handed to the decoding processes ahead of
+            the one being extracted, caps the memory held by the pool. Default is twice `decode_processes`.
+        chunk_bytes (Optional[int]): The maximum size of a batch in bytes of BSON, e.g. `32 * 1024 * 1024`. The
+            number of documents of a batch is fitted to it from the average document size in the collection
+            stats, with `chunk_size` as the maximum. The batches are also split at document boundaries so
+            none goes over it. Default is None, batches of `chunk_size` documents.
+        pipeline (Optional[List[Dict[str, Any]]]): Aggregation stages (`$unwind`, `$project`, `$addFields`, ...)
+            to run on the server in place of `find()`, e.g. to land a flat table from nested arrays. They run
+            after the filter, the incremental window, the parallel batch bounds and the projection, which are
+            still applied to the documents of the collection. The output needs a unique `_id` (the primary key)
+            and, with `incremental`, the cursor field.
+        explain (Optional[bool]): Explain the query of each collection before loading it. The plan, i.e. the scan
+            (IXSCAN or COLLSCAN), the index, whether the server sorts in memory and the estimated number of
+            documents examined, is logged and stored in the resource state under `query_plan`. Default is False.
+        skip_unindexed_sort (Optional[bool]): Drop the server-side sort on the incremental cursor field when no
+            index provides it, instead of a blocking in-memory sort. The incremental window is pushed down to the
+            filter, so the rows don't need to come in order; the sort is kept when `limit` is set. Default is False.
+        loader_strategy (Optional[TLoaderStrategy]): How the loader of each collection is picked.
+            Supported strategies:
+                manual - from `parallel`, `batch_strategy`, `data_item_format` and `chunk_size`. Default.
+                auto - from the collection stats, its indexes and a sample of its documents: range-parallel
+                    for large collections with an indexed split field, Arrow for flat documents and a chunk
+                    size fitted to the average document size. The choice is logged and replaces those
+                    arguments, set any of them in the `[sources.mongodb.loader.<collection>]` config section
+                    to override it.
+        checkpoint (Optional[bool]): Make a failed load of a large collection resume instead of starting over.
+            The documents are read in `_id` order into Parquet files (`data_item_format` 'arrow' becomes
+            'parquet'), each finished file is recorded with its last `_id`, and a run following a failed
+            extract keeps those files and continues after that `_id`. Needs 'arrow' or 'parquet' and is
+            ignored with `incremental` or `pipeline`. Default is False.
         limit (Optional[int]): The number of documents load.
         chunk_size (Optional[int]): The number of documents load in each batch.
-        data_item_format (Optional[TDataItemFormat]): The data format to use for loading.
+        data_item_format (Optional[TMongoDataItemFormat]): The data format to use for loading.
             Supported formats:
                 object - Python objects (dicts, lists).
                 arrow - Apache Arrow tables.
+                parquet - Parquet files streamed from the raw BSON batches in row groups of `chunk_size`
+                    documents and imported into the load package as they are. Needs a fixed schema, the
+                    `pymongoarrow_schema` is inferred when not given. Not supported with `incremental`.
         filter_ (Optional[Dict[str, Any]]): The filter to apply to the collection.
         projection: (Optional[Union[Mapping[str, Any], Iterable[str]]]): The projection to select fields
             when loading the collection. Supported inputs:
@@ -132,10 +263,72 @@ def mongodb_collection(
                 exclude (dict) - {"released": False, "runtime": False}
             Note: Can't mix include and exclude statements '{"title": True, "released": False}`
         pymongoarrow_schema (pymongoarrow.schema.Schema): Mapping of expected field types to convert BSON to Arrow
+            Pass "auto" to infer the schema from a sample of the collection and cache it on disk, it is
+            inferred again when the newest documents have new fields or types.
 
     Returns:
         Iterable[DltResource]: A list of DLT resources for each collection to be loaded.
     """
+    return dlt.resource(  # type: ignore
+        database_collection_documents,
+        name=collection,
+        primary_key="_id",
+        write_disposition=write_disposition,
+    )(
+        connection_url,
+        database,
+        collection,
+        incremental=incremental,
+        parallel=parallel,
+        batch_strategy=batch_strategy,
+        decode_processes=decode_processes,
+        decode_queue_depth=decode_queue_depth,
+        chunk_bytes=chunk_bytes,
+        pipeline=pipeline,
+        explain=explain,
+        skip_unindexed_sort=skip_unindexed_sort,
+        loader_strategy=loader_strategy,
+        checkpoint=checkpoint,
+        limit=limit,
+        chunk_size=chunk_size,
+        data_item_format=data_item_format,
+        filter_=filter_ or {},
+        projection=projection,
+        pymongoarrow_schema=pymongoarrow_schema,
+    )
+
+
+@dlt.resource(
+    name=lambda args: args["collection"],
+    standalone=True,
+    spec=MongoDbChangeStreamResourceConfiguration,
+)
+def mongodb_collection_changes(
+    connection_url: str = dlt.secrets.value,
+    database: Optional[str] = dlt.config.value,
+    collection: str = dlt.config.value,
+    chunk_size: Optional[int] = 10000,
+    max_await_time_ms: Optional[int] = 1000,
+) -> Any:
+    """
+    A DLT source which loads the changes of a collection from its change stream (CDC).
+
+    Each run continues from the resume token stored in the resource state and merges
+    inserted, updated and replaced documents by `_id`, deleted documents are removed from
+    the destination. Change streams need a replica set, a single-node one is enough locally.
+    The first run only marks the position to start from, so load the current documents
+    with `mongodb_collection` before.
+
+    Args:
+        connection_url (str): Database connection_url.
+        database (Optional[str]): Selected database name, it will use the default database if not passed.
+        collection (str): The collection name to watch.
+        chunk_size (Optional[int]): The number of changes load in each batch.
+        max_await_time_ms (Optional[int]): How long to wait for new changes before the run stops.
+
+    Returns:
+        DltResource: A DLT resource with the changes of the collection.
+    """
     # set up mongo client
     client = client_from_credentials(connection_url)
     if not database:
@@ -146,19 +339,17 @@ def mongodb_collection(
     collection_obj = mongo_database[collection]
 
     return dlt.resource(  # type: ignore
-        collection_documents,
+        collection_changes,
         name=collection_obj.name,
         primary_key="_id",
-        write_disposition=write_disposition,
+        write_disposition="merge",
+        columns={
+            "_change_deleted": {"data_type": "bool", "hard_delete": True},
+            "_change_seq": {"data_type": "bigint", "dedup_sort": "desc"},
+        },
     )(
         client,
         collection_obj,
-        incremental=incremental,
-        parallel=parallel,
-        limit=limit,
         chunk_size=chunk_size,
-        data_item_format=data_item_format,
-        filter_=filter_ or {},
-        projection=projection,
-        pymongoarrow_schema=pymongoarrow_schema,
+        max_await_time_ms=max_await_time_ms,
     )
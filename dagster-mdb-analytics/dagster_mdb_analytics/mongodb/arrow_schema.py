@@ -0,0 +1,210 @@
+"""Inference and on-disk caching of pymongoarrow schemas"""
+
+import hashlib
+import os
+import struct
+import uuid
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import dlt
+from bson import json_util
+from dlt.common import logger
+
+# number of documents sampled to infer a schema
+SCHEMA_SAMPLE_SIZE = 1000
+
+
+def auto_pymongoarrow_schema(
+    collection: Any,
+    sample_size: int = SCHEMA_SAMPLE_SIZE,
+    cache_dir: Optional[str] = None,
+    pipeline: Optional[List[Dict[str, Any]]] = None,
+) -> Any:
+    """Get the pymongoarrow schema of a collection, inferred from a sample and cached on disk.
+
+    The cached schema is checked against the newest `sample_size` documents on each call
+    and inferred again when they have fields or types the schema doesn't know about,
+    since pymongoarrow silently decodes mismatching values as nulls.
+
+    Args:
+        collection (Collection): The collection `pymongo.collection.Collection` to get the schema of.
+        sample_size (int): The number of documents to infer the schema from.
+        cache_dir (Optional[str]): The directory of the cached schemas, by default
+            `mongodb_schemas` in the dlt data directory.
+        pipeline (Optional[List[Dict[str, Any]]]): The aggregation stages the documents are
+            loaded with, the schema is inferred from their output.
+
+    Returns:
+        pymongoarrow.schema.Schema: The schema of the collection.
+    """
+    from pymongoarrow.schema import Schema  # type: ignore
+
+    pipeline = pipeline or []
+    name = f"{collection.database.name}.{collection.name}"
+    if pipeline:
+        # each pipeline has its own output schema
+        digest = hashlib.sha1(json_util.dumps(pipeline).encode()).hexdigest()[:10]
+        name = f"{name}.{digest}"
+    path = os.path.join(
+        cache_dir or os.path.join(dlt.current.run().data_dir, "mongodb_schemas"),
+        f"{name}.arrow",
+    )
+    cached = _read_schema(path)
+
+    # ObjectIds grow over time, so the newest documents come first
+    newest = _infer_arrow_schema(
+        collection.aggregate_raw_batches(
+            [{"$sort": {"_id": -1}}, {"$limit": sample_size}, *pipeline]
+        ),
+        collection.codec_options,
+    )
+    if cached is not None and not _has_mismatch(cached, newest):
+        return Schema.from_arrow(cached)
+
+    if cached is not None:
+        logger.info(
+            f"Collection `{collection.name}` doesn't match its cached pymongoarrow schema, "
+            "inferring it again."
+        )
+    schema = _merge_schemas(
+        _infer_arrow_schema(
+            collection.aggregate_raw_batches(
+                [{"$sample": {"size": sample_size}}, *pipeline]
+            ),
+            collection.codec_options,
+        ),
+        newest,
+    )
+    _write_schema(path, schema)
+    return Schema.from_arrow(schema)
+
+
+def _infer_arrow_schema(raw_batches: Iterable[bytes], codec_options: Any) -> Any:
+    """Infer the Arrow schema of raw BSON batches, widened to fit values not seen yet.
+
+    pymongoarrow types a field by its first value, so each document is inferred on
+    its own and the schemas are merged, see `_merge_types`: the schema doesn't depend
+    on the order of the sampled documents.
+    """
+    from dlt.common.libs.pyarrow import pyarrow
+    from pymongoarrow.context import PyMongoArrowContext  # type: ignore
+    from pymongoarrow.lib import process_bson_stream  # type: ignore
+
+    schema = pyarrow.schema([])
+    for batch in raw_batches:
+        for document in _split_documents(batch):
+            context = PyMongoArrowContext.from_schema(
+                schema=None, codec_options=codec_options
+            )
+            process_bson_stream(document, context)
+            fields = []
+            for field in context.finish().schema:
+                type_ = _widen_type(field.type)
+                if type_ is not None:
+                    fields.append(pyarrow.field(field.name, type_))
+            schema = _merge_schemas(schema, pyarrow.schema(fields))
+    return schema
+
+
+def _split_documents(batch: bytes) -> Iterator[bytes]:
+    """Split a raw BSON batch into its documents, each starts with its int32 size."""
+    start = 0
+    while start < len(batch):
+        size = struct.unpack_from("<i", batch, start)[0]
+        yield batch[start : start + size]
+        start += size
+
+
+def _widen_type(type_: Any) -> Any:
+    """Widen int32 to int64 and drop types which can't be decoded to (nulls, empty lists)."""
+    from dlt.common.libs.pyarrow import pyarrow
+
+    if pyarrow.types.is_null(type_):
+        return None
+    if pyarrow.types.is_int32(type_):
+        return pyarrow.int64()
+    if pyarrow.types.is_list(type_):
+        value_type = _widen_type(type_.value_type)
+        return pyarrow.list_(value_type) if value_type is not None else None
+    if pyarrow.types.is_struct(type_):
+        fields = [
+            pyarrow.field(field.name, widened)
+            for field in type_
+            if (widened := _widen_type(field.type)) is not None
+        ]
+        return pyarrow.struct(fields) if fields else None
+    return type_
+
+
+def _has_mismatch(schema: Any, other: Any) -> bool:
+    """Tell if `other` has fields missing from `schema` or which `schema` must widen to fit."""
+    return any(
+        schema.get_field_index(field.name) == -1
+        or _merge_types(schema.field(field.name).type, field.type)
+        != schema.field(field.name).type
+        for field in other
+    )
+
+
+def _merge_schemas(schema: Any, other: Any) -> Any:
+    """Merge the types of the fields in both schemas, add the fields missing from `schema`."""
+    from dlt.common.libs.pyarrow import pyarrow
+
+    return pyarrow.schema(_merge_fields(schema, other))
+
+
+def _merge_fields(fields: Any, other: Any) -> List[Any]:
+    """Merge the fields of a schema or struct type with the ones of another."""
+    from dlt.common.libs.pyarrow import pyarrow
+
+    merged = [
+        pyarrow.field(field.name, _merge_types(field.type, other.field(field.name).type))
+        if other.get_field_index(field.name) != -1
+        else field
+        for field in fields
+    ]
+    return merged + [field for field in other if fields.get_field_index(field.name) == -1]
+
+
+def _merge_types(type_: Any, other: Any) -> Any:
+    """The type which decodes the values of both types without losing data.
+
+    Integers and doubles make doubles (the integers are already widened to int64),
+    structs and lists are merged field by field. Other conflicting types keep `type_`,
+    the values of `other` are decoded as nulls.
+    """
+    from dlt.common.libs.pyarrow import pyarrow
+
+    if type_ == other:
+        return type_
+    if pyarrow.types.is_integer(type_) and pyarrow.types.is_integer(other):
+        return pyarrow.int64()
+    numeric = (pyarrow.types.is_integer, pyarrow.types.is_floating)
+    if any(is_(type_) for is_ in numeric) and any(is_(other) for is_ in numeric):
+        return pyarrow.float64()
+    if pyarrow.types.is_struct(type_) and pyarrow.types.is_struct(other):
+        return pyarrow.struct(_merge_fields(type_, other))
+    if pyarrow.types.is_list(type_) and pyarrow.types.is_list(other):
+        return pyarrow.list_(_merge_types(type_.value_type, other.value_type))
+    return type_
+
+
+def _read_schema(path: str) -> Any:
+    from dlt.common.libs.pyarrow import pyarrow
+
+    # registers the pymongoarrow extension types before they are deserialized
+    import pymongoarrow.types  # type: ignore # noqa: F401
+
+    if not os.path.isfile(path):
+        return None
+    with open(path, "rb") as f:
+        return pyarrow.ipc.read_schema(pyarrow.py_buffer(f.read()))
+
+
+def _write_schema(path: str, schema: Any) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # the cache is shared by the pipelines running at the same time
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(schema.serialize().to_pybytes())
+    os.replace(tmp_path, path)
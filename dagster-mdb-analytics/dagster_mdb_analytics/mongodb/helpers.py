@@ -1,9 +1,22 @@
 """Mongo database source helpers"""
 
+import atexit
+import multiprocessing
+import os
+import shutil
+import struct
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
 from itertools import islice
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
+    Deque,
     Dict,
     Iterator,
     List,
@@ -12,16 +25,20 @@ from typing import (
     Union,
     Iterable,
     Mapping,
+    Literal,
 )
 
 import dlt
+from bson import decode, decode_all, json_util
+from bson.codec_options import CodecOptions
 from bson.decimal128 import Decimal128
 from bson.objectid import ObjectId
 from bson.regex import Regex
 from bson.timestamp import Timestamp
-from dlt.common import logger
+from dlt.common import logger, pendulum
+from dlt.common.configuration import resolve_configuration
 from dlt.common.configuration.specs import BaseConfiguration, configspec
-from dlt.common.data_writers import TDataItemFormat
+from dlt.common.storages.exceptions import CurrentLoadPackageStateNotAvailable
 from dlt.common.time import ensure_pendulum_datetime
 from dlt.common.typing import TDataItem
 from dlt.common.utils import map_nested_in_place
@@ -29,8 +46,11 @@ from pendulum import _datetime
 from pymongo import ASCENDING, DESCENDING, MongoClient
 from pymongo.collection import Collection
 from pymongo.cursor import Cursor
+from pymongo.errors import OperationFailure
 from pymongo.helpers_shared import _fields_list_to_dict
 
+from .arrow_schema import auto_pymongoarrow_schema
+from .loader_strategy import auto_loader_settings
 
 if TYPE_CHECKING:
     TMongoClient = MongoClient[Any]
@@ -48,6 +68,103 @@ try:
 except ImportError:
     PYMONGOARROW_AVAILABLE = False
 
+TBatchStrategy = Literal["skip", "range", "keyset"]
+TMongoDataItemFormat = Literal["object", "arrow", "parquet"]
+TLoaderStrategy = Literal["manual", "auto"]
+
+# number of split key values sampled per batch to pick the range boundaries
+RANGE_SAMPLES_PER_BATCH = 20
+
+# number of `chunk_size` row groups written to each Parquet file
+PARQUET_ROW_GROUPS_PER_FILE = 10
+
+# documents the query of an index scan runs up to when its plan is explained
+EXPLAIN_DOCS_LIMIT = 1000
+
+
+class ExtractionMetrics:
+    """
+    Counters of a collection load, stored in the resource state under
+    `extraction_metrics` after each batch.
+
+    `fetch_s` is the time spent waiting on the server, `decode_s` the BSON decoding
+    and `convert_s` the `ConversionPlan`/`convert_arrow_columns` conversion. The
+    find cursors of the object loaders decode while fetching, so their decoding is
+    part of `fetch_s` and their `bytes` aren't known. The times are summed over the
+    batches, with the parallel loaders they add up to more than `elapsed_s`.
+    """
+
+    def __init__(self) -> None:
+        self.documents = 0
+        self.bytes = 0
+        self.batches = 0
+        self.fetch_s = 0.0
+        self.decode_s = 0.0
+        self.convert_s = 0.0
+        self.batch_latencies: List[float] = []
+        self.started_at = time.perf_counter()
+        # the resource state to store the metrics in, set by `collection_documents`
+        self.state: Optional[Dict[str, Any]] = None
+        # the parallel loaders report from the worker threads
+        self._lock = threading.Lock()
+
+    def add_batch(
+        self,
+        documents: int,
+        bytes_: int = 0,
+        fetch_s: float = 0.0,
+        decode_s: float = 0.0,
+        convert_s: float = 0.0,
+    ) -> None:
+        """Count a batch of documents handed to dlt."""
+        with self._lock:
+            self.documents += documents
+            self.bytes += bytes_
+            self.batches += 1
+            self.fetch_s += fetch_s
+            self.decode_s += decode_s
+            self.convert_s += convert_s
+            self.batch_latencies.append(fetch_s + decode_s + convert_s)
+            # deferred batches may finish after the resource generator, so the
+            # state is updated with every batch rather than at the end
+            if self.state is not None:
+                self.state["extraction_metrics"] = self.as_dict()
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed_s = time.perf_counter() - self.started_at
+        latencies = sorted(self.batch_latencies)
+        return {
+            "documents": self.documents,
+            "bytes": self.bytes,
+            "batches": self.batches,
+            "elapsed_s": round(elapsed_s, 3),
+            "documents_per_s": round(self.documents / elapsed_s, 1) if elapsed_s else None,
+            "fetch_s": round(self.fetch_s, 3),
+            "decode_s": round(self.decode_s, 3),
+            "convert_s": round(self.convert_s, 3),
+            "batch_latency_p50_s": _percentile(latencies, 0.5),
+            "batch_latency_p95_s": _percentile(latencies, 0.95),
+        }
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest rank percentile of sorted `values`."""
+    if not values:
+        return None
+    return round(values[round(q * (len(values) - 1))], 4)
+
+
+def _timed(items: Iterable[Any]) -> Iterator[Tuple[Any, float]]:
+    """Yield the items with the time spent waiting for each of them."""
+    iterator = iter(items)
+    while True:
+        started_at = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        yield item, time.perf_counter() - started_at
+
 
 class CollectionLoader:
     def __init__(
@@ -56,11 +173,22 @@ class CollectionLoader:
         collection: TCollection,
         chunk_size: int,
         incremental: Optional[dlt.sources.incremental[Any]] = None,
+        chunk_bytes: Optional[int] = None,
+        pipeline: Optional[List[Dict[str, Any]]] = None,
     ) -> None:
         self.client = client
         self.collection = collection
         self.incremental = incremental
         self.chunk_size = chunk_size
+        self.chunk_bytes = chunk_bytes
+        self.pipeline = pipeline
+        self.batch_size = client_configuration().batch_size
+        self.sort_skipped = False
+        self.metrics = ExtractionMetrics()
+        self._conversion_plan = ConversionPlan()
+
+        if chunk_bytes:
+            self.chunk_size = self._chunk_size_from_bytes(chunk_size, chunk_bytes)
 
         if incremental:
             self.cursor_field = incremental.cursor_path
@@ -69,9 +197,84 @@ class CollectionLoader:
             self.cursor_column = None
             self.last_value = None
 
+    def _chunk_size_from_bytes(self, chunk_size: int, chunk_bytes: int) -> int:
+        """Fit the number of documents of a chunk to `chunk_bytes` of BSON.
+
+        Uses the average document size from the collection storage stats,
+        `chunk_size` stays the maximum number of documents.
+
+        Args:
+            chunk_size (int): The maximum number of documents of a chunk.
+            chunk_bytes (int): The size of a chunk in bytes.
+
+        Returns:
+            int: The number of documents of a chunk.
+        """
+        try:
+            stats = next(
+                self.collection.aggregate([{"$collStats": {"storageStats": {}}}]), None
+            )
+        except OperationFailure as exc:
+            logger.warning(
+                f"Can't read the storage stats of `{self.collection.name}`, chunks keep "
+                f"`chunk_size` documents and are split by `chunk_bytes` when loading: {exc}"
+            )
+            return chunk_size
+
+        avg_size = (stats or {}).get("storageStats", {}).get("avgObjSize")
+        if not avg_size:
+            return chunk_size
+        return max(1, min(chunk_size, chunk_bytes // int(avg_size)))
+
+    def _split_chunks(self, batch: bytes) -> Iterator[bytes]:
+        """Split a raw BSON batch into chunks of at most `chunk_bytes`, if given."""
+        if not self.chunk_bytes:
+            return iter((batch,))
+        return _split_raw_batch(batch, self.chunk_bytes)
+
+    def _decode_chunks(self, batches: TCursor) -> Iterator[TDataItem]:
+        """Decode and convert raw BSON batches in chunks of at most `chunk_bytes`."""
+        for batch, fetch_s in _timed(batches):
+            for chunk in self._split_chunks(batch):
+                started_at = time.perf_counter()
+                docs = decode_all(chunk, self.collection.codec_options)
+                decoded_at = time.perf_counter()
+                documents = self._conversion_plan.convert(docs)
+                self.metrics.add_batch(
+                    len(documents),
+                    bytes_=len(chunk),
+                    fetch_s=fetch_s,
+                    decode_s=decoded_at - started_at,
+                    convert_s=time.perf_counter() - decoded_at,
+                )
+                # the wait for the raw batch is counted with its first chunk
+                fetch_s = 0.0
+                yield documents
+
+    def _decode_arrow_chunks(self, batches: TCursor, context: Any) -> Iterator[Any]:
+        """Decode raw BSON batches into tables of at most `chunk_bytes` of BSON."""
+        from pymongoarrow.lib import process_bson_stream  # type: ignore
+
+        for batch, fetch_s in _timed(batches):
+            for chunk in self._split_chunks(batch):
+                started_at = time.perf_counter()
+                process_bson_stream(chunk, context)
+                table = context.finish()
+                decoded_at = time.perf_counter()
+                table = convert_arrow_columns(table)
+                self.metrics.add_batch(
+                    table.num_rows,
+                    bytes_=len(chunk),
+                    fetch_s=fetch_s,
+                    decode_s=decoded_at - started_at,
+                    convert_s=time.perf_counter() - decoded_at,
+                )
+                fetch_s = 0.0
+                yield table
+
     @property
     def _sort_op(self) -> List[Optional[Tuple[str, int]]]:
-        if not self.incremental or not self.last_value:
+        if not self.incremental or not self.last_value or self.sort_skipped:
             return []
 
         if (
@@ -167,14 +370,164 @@ class CollectionLoader:
             Cursor: The cursor with the limit applied (if given).
         """
         if limit not in (0, None):
-            if self.incremental is None or self.incremental.last_value_func is None:
+            self._warn_if_unordered()
+            cursor = cursor.limit(abs(limit))
+
+        return cursor
+
+    def _warn_if_unordered(self) -> None:
+        if self.incremental is None or self.incremental.last_value_func is None:
+            logger.warning("Using limit without ordering - results may be inconsistent.")
+
+    def plan_query(
+        self,
+        filter_: Dict[str, Any],
+        limit: Optional[int] = None,
+        projection: Optional[Union[Mapping[str, Any], Iterable[str]]] = None,
+        skip_unindexed_sort: bool = False,
+    ) -> Dict[str, Any]:
+        """Explain the query of the load and tell how the server runs it.
+
+        The query itself doesn't run whole. The number of documents examined is an
+        estimate: for an index scan the filter runs with `executionStats` up to
+        `EXPLAIN_DOCS_LIMIT` documents, which counts the documents in the index bounds
+        when there are fewer. Otherwise it is the number of documents of the
+        collection, from its metadata.
+
+        Args:
+            filter_ (Dict[str, Any]): The filter to apply to the collection.
+            limit (Optional[int]): The number of documents to load.
+            projection (Optional[Union[Mapping[str, Any], Iterable[str]]]): The projection to select fields to create the Cursor.
+            skip_unindexed_sort (bool): Drop the sort of the incremental cursor field if
+                no index provides it and the load has no limit, the incremental window is
+                pushed down to the filter, so the rows don't need to come in order.
+
+        Returns:
+            Dict[str, Any]: The `scan` (IXSCAN, COLLSCAN), the `index` used, whether the
+                server sorts in memory (`blocking_sort`), whether the sort was skipped
+                (`sort_skipped`) and the `docs_examined_estimate`.
+        """
+        filter_op = self._filter_op
+        _raise_if_intersection(filter_op, filter_)
+        filter_op.update(filter_)
+
+        projection_op = self._projection_op(projection)
+
+        if self.pipeline:
+            command: Dict[str, Any] = {
+                "aggregate": self.collection.name,
+                "pipeline": self._pipeline_op(filter_op, projection_op, limit=limit),
+                "cursor": {},
+            }
+        else:
+            command = {"find": self.collection.name, "filter": filter_op}
+            if self._sort_op:
+                command["sort"] = dict(self._sort_op)  # type: ignore
+            if projection_op:
+                command["projection"] = projection_op
+        explained = self.collection.database.command(
+            "explain", command, verbosity="queryPlanner"
+        )
+
+        stages: List[str] = []
+        indexes: List[str] = []
+        _collect_plan_stages(explained, stages, indexes)
+        if "COLLSCAN" in stages:
+            scan = "COLLSCAN"
+        elif any(stage.endswith("IXSCAN") or stage == "IDHACK" for stage in stages):
+            scan = "IXSCAN"
+        else:
+            scan = stages[-1] if stages else None
+
+        docs_examined = None
+        if scan == "IXSCAN" and filter_op:
+            stats = self.collection.database.command(
+                "explain",
+                {
+                    "find": self.collection.name,
+                    "filter": filter_op,
+                    "limit": EXPLAIN_DOCS_LIMIT,
+                },
+                verbosity="executionStats",
+            )["executionStats"]
+            if stats["nReturned"] < EXPLAIN_DOCS_LIMIT:
+                docs_examined = stats["totalDocsExamined"]
+        if docs_examined is None:
+            docs_examined = self.collection.estimated_document_count()
+
+        blocking_sort = "SORT" in stages
+        if blocking_sort and skip_unindexed_sort and self._sort_op:
+            if limit:
                 logger.warning(
-                    "Using limit without ordering - results may be inconsistent."
+                    f"No index of `{self.collection.name}` provides the sort on "
+                    f"`{self.cursor_field}`, it is kept since the load has a limit."
                 )
+            else:
+                self.sort_skipped = True
+
+        return dict(
+            scan=scan,
+            index=indexes[0] if indexes else None,
+            blocking_sort=blocking_sort,
+            sort_skipped=self.sort_skipped,
+            docs_examined_estimate=docs_examined,
+        )
 
-            cursor = cursor.limit(abs(limit))
+    def _pipeline_op(
+        self,
+        filter_op: Dict[str, Any],
+        projection_op: Optional[Dict[str, Any]],
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Build the aggregation running `pipeline` on the documents selected by the query.
 
-        return cursor
+        The filter, sort, skip, limit and projection are applied to the documents
+        of the collection before the stages of `pipeline`, the same as with `find()`.
+
+        Args:
+            filter_op (Dict[str, Any]): The filter to apply to the collection.
+            projection_op (Optional[Dict[str, Any]]): The projection to apply to the collection.
+            skip (Optional[int]): The number of documents to skip.
+            limit (Optional[int]): The number of documents to load.
+
+        Returns:
+            List[Dict[str, Any]]: The stages of the aggregation.
+        """
+        stages: List[Dict[str, Any]] = [{"$match": filter_op}]
+        if self._sort_op:
+            stages.append({"$sort": dict(self._sort_op)})  # type: ignore
+        if skip:
+            stages.append({"$skip": skip})
+        if limit not in (0, None):
+            stages.append({"$limit": abs(limit)})  # type: ignore
+        if projection_op:
+            stages.append({"$project": projection_op})
+
+        return stages + self.pipeline  # type: ignore
+
+    def _raw_batches(
+        self,
+        filter_op: Dict[str, Any],
+        limit: Optional[int],
+        projection_op: Optional[Dict[str, Any]],
+    ) -> TCursor:
+        """Get a cursor over raw BSON batches of `chunk_size` documents."""
+        if self.pipeline:
+            if limit not in (0, None):
+                self._warn_if_unordered()
+            return self.collection.aggregate_raw_batches(
+                self._pipeline_op(filter_op, projection_op, limit=limit),
+                batchSize=self.chunk_size,
+            )
+
+        cursor = self.collection.find_raw_batches(
+            filter=filter_op, batch_size=self.chunk_size, projection=projection_op
+        )
+        if self._sort_op:
+            cursor = cursor.sort(self._sort_op)  # type: ignore
+
+        return self._limit(cursor, limit)  # type: ignore
 
     def load_documents(
         self,
@@ -198,25 +551,108 @@ class CollectionLoader:
 
         projection_op = self._projection_op(projection)
 
-        cursor = self.collection.find(filter=filter_op, projection=projection_op)
-        if self._sort_op:
-            cursor = cursor.sort(self._sort_op)
+        if self.chunk_bytes:
+            yield from self._load_byte_chunks(filter_op, limit, projection_op)
+            return
 
-        cursor = self._limit(cursor, limit)
+        if self.pipeline:
+            if limit not in (0, None):
+                self._warn_if_unordered()
+            cursor = self.collection.aggregate(
+                self._pipeline_op(filter_op, projection_op, limit=limit),
+                batchSize=self.batch_size,
+            )
+        else:
+            cursor = self.collection.find(filter=filter_op, projection=projection_op)
+            if self._sort_op:
+                cursor = cursor.sort(self._sort_op)
+            if self.batch_size:
+                cursor = cursor.batch_size(self.batch_size)
+
+            cursor = self._limit(cursor, limit)
+
+        while True:
+            started_at = time.perf_counter()
+            docs_slice = list(islice(cursor, self.chunk_size))
+            if not docs_slice:
+                break
+            fetched_at = time.perf_counter()
+            documents = self._conversion_plan.convert(docs_slice)
+            self.metrics.add_batch(
+                len(documents),
+                fetch_s=fetched_at - started_at,
+                convert_s=time.perf_counter() - fetched_at,
+            )
+            yield documents
 
-        while docs_slice := list(islice(cursor, self.chunk_size)):
-            yield map_nested_in_place(convert_mongo_objs, docs_slice)
+    def _load_byte_chunks(
+        self,
+        filter_op: Dict[str, Any],
+        limit: Optional[int],
+        projection_op: Optional[Dict[str, Any]],
+    ) -> Iterator[TDataItem]:
+        """Load the documents in chunks of at most `chunk_bytes` of BSON.
+
+        The raw batches are split on document boundaries before being decoded,
+        so a run of large documents can't make a chunk exceed the budget.
+        """
+        batches = self._raw_batches(filter_op, limit, projection_op)
+        yield from self._decode_chunks(batches)
 
 
 class CollectionLoaderParallel(CollectionLoader):
+    def __init__(
+        self,
+        client: TMongoClient,
+        collection: TCollection,
+        chunk_size: int,
+        incremental: Optional[dlt.sources.incremental[Any]] = None,
+        batch_strategy: TBatchStrategy = "skip",
+        chunk_bytes: Optional[int] = None,
+        pipeline: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        super().__init__(
+            client,
+            collection,
+            chunk_size,
+            incremental=incremental,
+            chunk_bytes=chunk_bytes,
+            pipeline=pipeline,
+        )
+        self.batch_strategy = batch_strategy
+
+    @property
+    def _split_key(self) -> str:
+        """The field used to split the collection into range batches."""
+        return self.cursor_field if self.incremental else "_id"
+
     def _get_document_count(self) -> int:
-        return self.collection.count_documents(filter=self._filter_op)
+        filter_op = self._filter_op
+        if self.batch_strategy == "range" and not filter_op:
+            # range batches only need a rough size, read from the collection metadata
+            return self.collection.estimated_document_count()
+
+        return self.collection.count_documents(filter=filter_op)
+
+    def _create_batches(
+        self, filter_: Dict[str, Any], limit: Optional[int] = None
+    ) -> Iterable[Dict[str, Any]]:
+        # with a limit the skipped prefix stays bounded, so skip batches are fine
+        if self.batch_strategy == "keyset":
+            if limit:
+                return self._create_skip_batches(abs(limit))
+            return self._iter_keyset_batches(filter_)
 
-    def _create_batches(self, limit: Optional[int] = None) -> List[Dict[str, int]]:
         doc_count = self._get_document_count()
         if limit:
             doc_count = min(doc_count, abs(limit))
 
+        if self.batch_strategy == "range" and not limit:
+            return self._create_range_batches(doc_count)
+
+        return self._create_skip_batches(doc_count)
+
+    def _create_skip_batches(self, doc_count: int) -> List[Dict[str, Any]]:
         batches = []
         left_to_load = doc_count
 
@@ -226,6 +662,152 @@ class CollectionLoaderParallel(CollectionLoader):
 
         return batches
 
+    def _create_range_batches(self, doc_count: int) -> List[Dict[str, Any]]:
+        """Split the collection into consecutive ranges of the split key.
+
+        The boundaries are picked from a random sample of the split key values,
+        so each batch runs an indexed range query instead of making the server
+        walk over the documents of all the preceding batches.
+
+        Args:
+            doc_count (int): The number of documents to load.
+
+        Returns:
+            List[Dict[str, Any]]: The `lower` (inclusive) and `upper` (exclusive)
+                bounds of each batch, `None` stands for an open end.
+        """
+        batch_count = -(-doc_count // self.chunk_size)
+        if batch_count <= 1:
+            return [dict(lower=None, upper=None)]
+
+        split_key = self._split_key
+        sample = self.collection.aggregate(
+            [
+                {"$match": self._filter_op},
+                {"$sample": {"size": batch_count * RANGE_SAMPLES_PER_BATCH}},
+                {"$project": {split_key: 1}},
+            ]
+        )
+        values = [
+            value for doc in sample if (value := _get_path(doc, split_key)) is not None
+        ]
+        try:
+            values.sort()
+        except TypeError:
+            logger.warning(
+                f"Values of `{split_key}` have mixed types and can't be split into "
+                "ranges, falling back to skip batches."
+            )
+            return self._create_skip_batches(doc_count)
+
+        bounds: List[Any] = []
+        for i in range(1, batch_count):
+            value = values[i * len(values) // batch_count] if values else None
+            if value is not None and (not bounds or value > bounds[-1]):
+                bounds.append(value)
+
+        return [
+            dict(lower=lower, upper=upper)
+            for lower, upper in zip([None, *bounds], [*bounds, None])
+        ]
+
+    def _iter_keyset_batches(self, filter_: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Split the collection into consecutive ranges of the split key, lazily.
+
+        Needs no document count: the upper bound of each range is found when the
+        batch is requested, while the earlier batches stream, by walking `chunk_size`
+        entries of the split key index with a covered query.
+
+        Args:
+            filter_ (Dict[str, Any]): The filter to apply to the collection.
+
+        Yields:
+            Iterator[Dict[str, Any]]: The `lower` (inclusive) and `upper` (exclusive)
+                bounds of each batch, `None` stands for an open end.
+        """
+        split_key = self._split_key
+        projection = {split_key: 1} if split_key == "_id" else {split_key: 1, "_id": 0}
+        lower = None
+        while True:
+            range_filter = self._batch_filter(filter_, dict(lower=lower, upper=None))
+            boundaries = (
+                self.collection.find(
+                    {"$and": [self._filter_op, range_filter]}, projection=projection
+                )
+                .sort(split_key, ASCENDING)
+                .skip(self.chunk_size)
+                .limit(1)
+            )
+            upper = next((_get_path(doc, split_key) for doc in boundaries), None)
+            if upper is not None and lower is not None:
+                if type(upper) is not type(lower):
+                    # values of other BSON types fall into the first range, see `_batch_filter`
+                    upper = None
+                elif upper <= lower:
+                    # more than `chunk_size` documents share the lower bound
+                    upper = next(
+                        (
+                            _get_path(doc, split_key)
+                            for doc in self.collection.find(
+                                {
+                                    "$and": [
+                                        self._filter_op,
+                                        filter_,
+                                        {split_key: {"$gt": lower}},
+                                    ]
+                                },
+                                projection=projection,
+                            )
+                            .sort(split_key, ASCENDING)
+                            .limit(1)
+                        ),
+                        None,
+                    )
+
+            yield dict(lower=lower, upper=upper)
+            if upper is None:
+                return
+            lower = upper
+
+    def _batch_filter(
+        self, filter_: Dict[str, Any], batch: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Restrict the filter to the split key range of a range batch.
+
+        Args:
+            filter_ (Dict[str, Any]): The filter to apply to the collection.
+            batch (Dict[str, Any]): The batch to build the filter for.
+
+        Returns:
+            Dict[str, Any]: The filter of the batch.
+        """
+        lower, upper = batch.get("lower"), batch.get("upper")
+        if lower is None and upper is None:
+            return filter_
+
+        if lower is None:
+            # the first range also takes the documents missing the split key
+            condition: Dict[str, Any] = {"$not": {"$gte": upper}}
+        else:
+            condition = {"$gte": lower}
+            if upper is not None:
+                condition["$lt"] = upper
+
+        return {"$and": [filter_, {self._split_key: condition}]}
+
+    def _batch_cursor(self, cursor: TCursor, batch: Dict[str, Any]) -> TCursor:
+        if self.pipeline:
+            # `cursor` builds the stages of the batch, see `_get_cursor`
+            return self._aggregate(
+                cursor(skip=batch.get("skip"), limit=batch.get("limit"))
+            )
+
+        cursor = cursor.clone()
+        if "skip" in batch:
+            cursor = cursor.skip(batch["skip"]).limit(batch["limit"])
+
+        return cursor
+
     def _get_cursor(
         self,
         filter_: Dict[str, Any],
@@ -246,21 +828,47 @@ class CollectionLoaderParallel(CollectionLoader):
 
         projection_op = self._projection_op(projection)
 
-        cursor = self.collection.find(filter=filter_op, projection=projection_op)
+        if self.pipeline:
+            # an aggregation runs when it's created, leave it to the worker of the batch
+            return partial(self._pipeline_op, filter_op, projection_op)
+
+        if self.chunk_bytes:
+            cursor = self.collection.find_raw_batches(
+                filter=filter_op, batch_size=self.chunk_size, projection=projection_op
+            )
+        else:
+            cursor = self.collection.find(filter=filter_op, projection=projection_op)
+            if self.batch_size:
+                cursor = cursor.batch_size(self.batch_size)
         if self._sort_op:
             cursor = cursor.sort(self._sort_op)
 
         return cursor
 
-    @dlt.defer
-    def _run_batch(self, cursor: TCursor, batch: Dict[str, int]) -> TDataItem:
-        cursor = cursor.clone()
+    def _aggregate(self, pipeline: List[Dict[str, Any]]) -> TCursor:
+        if self.chunk_bytes:
+            return self.collection.aggregate_raw_batches(
+                pipeline, batchSize=self.chunk_size
+            )
+        return self.collection.aggregate(pipeline, batchSize=self.batch_size)
 
-        data = []
-        for document in cursor.skip(batch["skip"]).limit(batch["limit"]):
-            data.append(map_nested_in_place(convert_mongo_objs, document))
+    @dlt.defer
+    def _run_batch(self, cursor: TCursor, batch: Dict[str, Any]) -> TDataItem:
+        if self.chunk_bytes:
+            # decoded here, the main thread only yields the chunks of the batch
+            return iter(list(self._decode_chunks(self._batch_cursor(cursor, batch))))
+
+        started_at = time.perf_counter()
+        docs = list(self._batch_cursor(cursor, batch))
+        fetched_at = time.perf_counter()
+        documents = self._conversion_plan.convert(docs)
+        self.metrics.add_batch(
+            len(documents),
+            fetch_s=fetched_at - started_at,
+            convert_s=time.perf_counter() - fetched_at,
+        )
 
-        return data
+        return documents
 
     def _get_all_batches(
         self,
@@ -278,10 +886,12 @@ class CollectionLoaderParallel(CollectionLoader):
         Yields:
             Iterator[TDataItem]: An iterator of the loaded documents.
         """
-        batches = self._create_batches(limit=limit)
-        cursor = self._get_cursor(filter_=filter_, projection=projection)
+        batches = self._create_batches(filter_=filter_, limit=limit)
 
         for batch in batches:
+            cursor = self._get_cursor(
+                filter_=self._batch_filter(filter_, batch), projection=projection
+            )
             yield self._run_batch(cursor=cursor, batch=batch)
 
     def load_documents(
@@ -306,6 +916,148 @@ class CollectionLoaderParallel(CollectionLoader):
             yield document
 
 
+class CollectionLoaderProcessPool(CollectionLoader):
+    """
+    Mongo DB collection loader, which decodes and converts
+    the documents in a pool of worker processes.
+
+    The main process only fetches the raw BSON batches and unpickles the converted
+    documents sent back by the workers, so decoding isn't bound to a single core.
+    The batches are yielded in the order they were fetched.
+    """
+
+    def __init__(
+        self,
+        client: TMongoClient,
+        collection: TCollection,
+        chunk_size: int,
+        incremental: Optional[dlt.sources.incremental[Any]] = None,
+        workers: int = 2,
+        queue_depth: Optional[int] = None,
+        chunk_bytes: Optional[int] = None,
+        pipeline: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        super().__init__(
+            client,
+            collection,
+            chunk_size,
+            incremental=incremental,
+            chunk_bytes=chunk_bytes,
+            pipeline=pipeline,
+        )
+        self.workers = workers
+        # raw batches sent to the workers and not yielded yet
+        self.queue_depth = queue_depth or 2 * workers
+
+    def load_documents(
+        self,
+        filter_: Dict[str, Any],
+        limit: Optional[int] = None,
+        projection: Optional[Union[Mapping[str, Any], Iterable[str]]] = None,
+    ) -> Iterator[TDataItem]:
+        """Construct the query and load the documents from the collection.
+
+        Args:
+            filter_ (Dict[str, Any]): The filter to apply to the collection.
+            limit (Optional[int]): The number of documents to load.
+            projection (Optional[Union[Mapping[str, Any], Iterable[str]]]): The projection to select fields to create the Cursor.
+
+        Yields:
+            Iterator[TDataItem]: An iterator of the loaded documents.
+        """
+        filter_op = self._filter_op
+        _raise_if_intersection(filter_op, filter_)
+        filter_op.update(filter_)
+
+        projection_op = self._projection_op(projection)
+
+        cursor = self._raw_batches(filter_op, limit, projection_op)
+
+        # the workers are spawned, forking would copy the threads of the pymongo client
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        pending: Deque[Tuple[Future[Tuple[List[TDataItem], float, float]], int, float]]
+        pending = deque()
+        try:
+            for batch, fetch_s in _timed(cursor):
+                for chunk in self._split_chunks(batch):
+                    future = executor.submit(
+                        _decode_raw_batch, chunk, self.collection.codec_options
+                    )
+                    pending.append((future, len(chunk), fetch_s))
+                    fetch_s = 0.0
+                    if len(pending) >= self.queue_depth:
+                        yield self._collect(*pending.popleft())
+
+            while pending:
+                yield self._collect(*pending.popleft())
+        finally:
+            for future, _, _ in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _collect(
+        self,
+        future: "Future[Tuple[List[TDataItem], float, float]]",
+        bytes_: int,
+        fetch_s: float,
+    ) -> List[TDataItem]:
+        """Wait for the documents of a worker and count them with its timings."""
+        documents, decode_s, convert_s = future.result()
+        self.metrics.add_batch(
+            len(documents),
+            bytes_=bytes_,
+            fetch_s=fetch_s,
+            decode_s=decode_s,
+            convert_s=convert_s,
+        )
+        return documents
+
+
+# conversion plan of the documents decoded by a worker process
+_worker_conversion_plan: Optional["ConversionPlan"] = None
+
+
+def _decode_raw_batch(
+    batch: bytes, codec_options: CodecOptions
+) -> Tuple[List[TDataItem], float, float]:
+    """Decode and convert a raw BSON batch, runs in a `CollectionLoaderProcessPool` worker.
+
+    Returns the documents with the decoding and conversion times.
+    """
+    global _worker_conversion_plan
+
+    if _worker_conversion_plan is None:
+        _worker_conversion_plan = ConversionPlan()
+    started_at = time.perf_counter()
+    docs = decode_all(batch, codec_options)
+    decoded_at = time.perf_counter()
+    documents = _worker_conversion_plan.convert(docs)
+    return documents, decoded_at - started_at, time.perf_counter() - decoded_at
+
+
+def _split_raw_batch(batch: bytes, max_bytes: int) -> Iterator[bytes]:
+    """Split a raw BSON batch into runs of whole documents of at most `max_bytes`.
+
+    A document larger than `max_bytes` makes a run on its own.
+    """
+    if len(batch) <= max_bytes:
+        yield batch
+        return
+
+    start = end = 0
+    while end < len(batch):
+        # each document starts with its size as a little endian int32
+        size = struct.unpack_from("<i", batch, end)[0]
+        if end > start and end + size - start > max_bytes:
+            yield batch[start:end]
+            start = end
+        end += size
+
+    yield batch[start:end]
+
+
 class CollectionArrowLoader(CollectionLoader):
     """
     Mongo DB collection loader, which uses
@@ -332,7 +1084,6 @@ class CollectionArrowLoader(CollectionLoader):
             Iterator[Any]: An iterator of the loaded documents.
         """
         from pymongoarrow.context import PyMongoArrowContext  # type: ignore
-        from pymongoarrow.lib import process_bson_stream  # type: ignore
 
         filter_op = self._filter_op
         _raise_if_intersection(filter_op, filter_)
@@ -340,28 +1091,299 @@ class CollectionArrowLoader(CollectionLoader):
 
         projection_op = self._projection_op(projection)
 
-        # NOTE the `filter_op` isn't passed
-        cursor = self.collection.find_raw_batches(
-            filter_, batch_size=self.chunk_size, projection=projection_op
+        cursor = self._raw_batches(filter_op, limit, projection_op)
+
+        context = PyMongoArrowContext.from_schema(
+            schema=pymongoarrow_schema, codec_options=self.collection.codec_options
         )
-        if self._sort_op:
-            cursor = cursor.sort(self._sort_op)  # type: ignore
+        yield from self._decode_arrow_chunks(cursor, context)
 
-        cursor = self._limit(cursor, limit)  # type: ignore
+
+class CollectionParquetLoader(CollectionArrowLoader):
+    """
+    Mongo DB collection loader, which streams the raw BSON
+    batches into Parquet files imported by dlt as they are.
+
+    The batches are decoded by pymongoarrow and written as row groups of
+    `chunk_size` documents, so memory stays bounded by a row group whatever the
+    size of the collection. dlt links the files into the load package, the rows
+    aren't written again by the extract step.
+
+    With `checkpoint`, the documents are read in `_id` order and the finished files
+    are recorded with the last `_id` in a `checkpoint.json` next to them. A run
+    following a failed extract keeps those files and continues after that `_id`.
+    The files are staged in the working directory of the pipeline, in a directory
+    of the run, see `_collection_dir`.
+    """
+
+    def __init__(
+        self,
+        client: TMongoClient,
+        collection: TCollection,
+        chunk_size: int,
+        incremental: Optional[dlt.sources.incremental[Any]] = None,
+        chunk_bytes: Optional[int] = None,
+        pipeline: Optional[List[Dict[str, Any]]] = None,
+        checkpoint: bool = False,
+    ) -> None:
+        super().__init__(
+            client,
+            collection,
+            chunk_size,
+            incremental=incremental,
+            chunk_bytes=chunk_bytes,
+            pipeline=pipeline,
+        )
+        self.checkpoint = checkpoint
+
+    @property
+    def _sort_op(self) -> List[Optional[Tuple[str, int]]]:
+        if self.checkpoint:
+            # the checkpoint is the last `_id` of the finished files
+            return [("_id", ASCENDING)]
+        return super()._sort_op
+
+    def load_documents(
+        self,
+        filter_: Dict[str, Any],
+        limit: Optional[int] = None,
+        projection: Optional[Union[Mapping[str, Any], Iterable[str]]] = None,
+        pymongoarrow_schema: Any = None,
+    ) -> Iterator[Any]:
+        """
+        Load documents from the collection into Parquet files.
+
+        Args:
+            filter_ (Dict[str, Any]): The filter to apply to the collection.
+            limit (Optional[int]): The number of documents to load.
+            projection (Optional[Union[Mapping[str, Any], Iterable[str]]]): The projection to select fields to create the Cursor.
+            pymongoarrow_schema (Any): The mapping of field types to convert BSON to Arrow,
+                all the files of a load need the same schema.
+
+        Yields:
+            Iterator[Any]: An iterator of the Parquet files to import.
+        """
+        from pyarrow import parquet
+        from pymongoarrow.context import PyMongoArrowContext  # type: ignore
+
+        filter_op = self._filter_op
+        _raise_if_intersection(filter_op, filter_)
+        filter_op.update(filter_)
+
+        projection_op = self._projection_op(projection)
+
+        collection_dir = self._collection_dir()
+        query = json_util.dumps(
+            [filter_op, projection_op, limit, self.chunk_size, str(pymongoarrow_schema)]
+        )
+        checkpoint = self._resume_checkpoint(collection_dir, query)
+        if checkpoint is None:
+            checkpoint = {"run": _load_id(), "query": query, "files": []}
+        files_dir = os.path.join(collection_dir, checkpoint["run"])
+        # the files of the previous runs of the pipeline were linked into their load packages
+        for run in os.listdir(collection_dir) if os.path.isdir(collection_dir) else []:
+            if run != checkpoint["run"]:
+                shutil.rmtree(os.path.join(collection_dir, run), ignore_errors=True)
+        os.makedirs(files_dir, exist_ok=True)
+        if checkpoint["files"]:
+            for file in checkpoint["files"]:
+                path = os.path.join(files_dir, file["name"])
+                yield _parquet_file_item(path, file["rows"], parquet.read_schema(path))
+            filter_op = {"$and": [filter_op, {"_id": {"$gt": checkpoint["last_id"]}}]}
+            if limit:
+                limit -= sum(file["rows"] for file in checkpoint["files"])
+                if limit <= 0:
+                    return
+
+        cursor = self._raw_batches(filter_op, limit, projection_op)
 
         context = PyMongoArrowContext.from_schema(
             schema=pymongoarrow_schema, codec_options=self.collection.codec_options
         )
-        for batch in cursor:
-            process_bson_stream(batch, context)
-            table = context.finish()
-            yield convert_arrow_columns(table)
+        writer, file_count, row_groups, rows = None, len(checkpoint["files"]), 0, 0
+        for row_group, last_chunk in self._iter_row_groups(cursor, context):
+            if writer is None:
+                file_count += 1
+                path = os.path.join(files_dir, f"{file_count}.parquet")
+                writer = parquet.ParquetWriter(path, row_group.schema)
+            writer.write_table(row_group, row_group_size=row_group.num_rows)
+            row_groups, rows = row_groups + 1, rows + row_group.num_rows
+
+            if row_groups == PARQUET_ROW_GROUPS_PER_FILE:
+                writer.close()
+                self._write_checkpoint(files_dir, checkpoint, path, rows, last_chunk)
+                yield _parquet_file_item(path, rows, row_group.schema)
+                writer, row_groups, rows = None, 0, 0
+
+        if writer is not None:
+            writer.close()
+            self._write_checkpoint(files_dir, checkpoint, path, rows, last_chunk)
+            yield _parquet_file_item(path, rows, row_group.schema)
+
+    def _collection_dir(self) -> str:
+        """The staging directory of the collection in the working directory of the pipeline.
+
+        Each run writes its files in a subdirectory named by its load id, so the
+        pipelines and the runs loading the collection at the same time don't share files.
+        """
+        return os.path.join(
+            dlt.current.pipeline().working_dir,
+            "mongodb_parquet",
+            self._checkpoint_key,
+        )
+
+    @property
+    def _checkpoint_key(self) -> str:
+        return f"{self.collection.database.name}.{self.collection.name}"
+
+    def _resume_checkpoint(
+        self, collection_dir: str, query: str
+    ) -> Optional[Dict[str, Any]]:
+        """Get the checkpoint left by a failed extract of the same query, if any.
+
+        The pipeline state is only kept when the extract succeeds, so a checkpoint
+        of the run stored in the state was loaded, and one of another run failed.
+        It is kept in the source state, dlt resets the state of `replace` resources
+        on each extract.
+        """
+        if not self.checkpoint or not os.path.isdir(collection_dir):
+            return None
+        state = _checkpoint_state().get(self._checkpoint_key, {})
+        for run in os.listdir(collection_dir):
+            files_dir = os.path.join(collection_dir, run)
+            try:
+                with open(
+                    os.path.join(files_dir, "checkpoint.json"), encoding="utf-8"
+                ) as f:
+                    checkpoint: Dict[str, Any] = json_util.loads(f.read())
+            except FileNotFoundError:
+                continue
+            if (
+                checkpoint["query"] == query
+                and checkpoint["run"] != state.get("run")
+                and checkpoint["files"]
+            ):
+                break
+        else:
+            return None
+
+        # the file being written when the extract failed
+        finished = {file["name"] for file in checkpoint["files"]} | {"checkpoint.json"}
+        for name in set(os.listdir(files_dir)) - finished:
+            os.remove(os.path.join(files_dir, name))
+        logger.info(
+            f"Resuming `{self.collection.name}` after `_id` {checkpoint['last_id']}, "
+            f"{len(checkpoint['files'])} files were written by the failed run."
+        )
+        return checkpoint
+
+    def _write_checkpoint(
+        self,
+        files_dir: str,
+        checkpoint: Dict[str, Any],
+        path: str,
+        rows: int,
+        last_chunk: bytes,
+    ) -> None:
+        """Record a finished file, with the `_id` of its last document."""
+        if not self.checkpoint:
+            return
+        checkpoint["files"].append({"name": os.path.basename(path), "rows": rows})
+        checkpoint["last_id"] = _last_document(
+            last_chunk, self.collection.codec_options
+        )["_id"]
+
+        checkpoint_path = os.path.join(files_dir, "checkpoint.json")
+        with open(f"{checkpoint_path}.tmp", "w", encoding="utf-8") as f:
+            f.write(json_util.dumps(checkpoint))
+        os.replace(f"{checkpoint_path}.tmp", checkpoint_path)
+
+        _checkpoint_state()[self._checkpoint_key] = {
+            "run": checkpoint["run"],
+            "files": len(checkpoint["files"]),
+            "documents": sum(file["rows"] for file in checkpoint["files"]),
+        }
+
+    def _iter_row_groups(
+        self, cursor: TCursor, context: Any
+    ) -> Iterator[Tuple[Any, bytes]]:
+        """Decode the raw BSON batches into tables of `chunk_size` rows or `chunk_bytes` of BSON.
+
+        Each table comes with the raw BSON chunk its last rows were decoded from.
+        """
+        from pymongoarrow.lib import process_bson_stream  # type: ignore
+        from dlt.common.libs.pyarrow import pyarrow
+
+        tables: List[Any] = []
+        size = 0
+        last_chunk = b""
+        for batch, fetch_s in _timed(cursor):
+            for chunk in self._split_chunks(batch):
+                if tables and self.chunk_bytes and size + len(chunk) > self.chunk_bytes:
+                    yield pyarrow.concat_tables(tables), last_chunk
+                    tables, size = [], 0
+
+                started_at = time.perf_counter()
+                process_bson_stream(chunk, context)
+                table = context.finish()
+                decoded_at = time.perf_counter()
+                tables.append(convert_arrow_columns(table))
+                self.metrics.add_batch(
+                    table.num_rows,
+                    bytes_=len(chunk),
+                    fetch_s=fetch_s,
+                    decode_s=decoded_at - started_at,
+                    convert_s=time.perf_counter() - decoded_at,
+                )
+                fetch_s = 0.0
+                size += len(chunk)
+                last_chunk = chunk
+                if sum(table.num_rows for table in tables) >= self.chunk_size:
+                    yield pyarrow.concat_tables(tables), last_chunk
+                    tables, size = [], 0
+
+        if tables:
+            yield pyarrow.concat_tables(tables), last_chunk
+
+
+def _load_id() -> str:
+    """The id of the load package being extracted, a new id outside of an extract."""
+    try:
+        return dlt.current.load_package()["load_id"]
+    except CurrentLoadPackageStateNotAvailable:
+        return uuid.uuid4().hex
+
+
+def _checkpoint_state() -> Dict[str, Any]:
+    """The runs of the `CollectionParquetLoader` checkpoints by `<database>.<collection>`."""
+    return dlt.current.source_state().setdefault("parquet_checkpoints", {})  # type: ignore
+
+
+def _last_document(chunk: bytes, codec_options: CodecOptions) -> Dict[str, Any]:
+    """Decode the last document of a raw BSON chunk."""
+    start = 0
+    while True:
+        size = struct.unpack_from("<i", chunk, start)[0]
+        if start + size >= len(chunk):
+            return decode(chunk[start:], codec_options)
+        start += size
+
+
+def _parquet_file_item(path: str, rows: int, schema: Any) -> Any:
+    """Mark a Parquet file to be imported into the load package of the resource."""
+    # the columns of the table are taken from the empty table, its rows are discarded
+    return dlt.mark.with_file_import(
+        path, "parquet", items_count=rows, hints=schema.empty_table()
+    )
 
 
 class CollectionArrowLoaderParallel(CollectionLoaderParallel):
     """
     Mongo DB collection parallel loader, which uses
     Apache Arrow for data processing.
+
+    Each batch is fetched, decoded and converted on a worker of the dlt
+    extract pool, sized with the `workers` option of the `extract` config section.
     """
 
     def load_documents(
@@ -407,9 +1429,11 @@ class CollectionArrowLoaderParallel(CollectionLoaderParallel):
         Yields:
             Iterator[TDataItem]: An iterator of the loaded documents.
         """
-        batches = self._create_batches(limit=limit)
-        cursor = self._get_cursor(filter_=filter_, projection=projection)
+        batches = self._create_batches(filter_=filter_, limit=limit)
         for batch in batches:
+            cursor = self._get_cursor(
+                filter_=self._batch_filter(filter_, batch), projection=projection
+            )
             yield self._run_batch(
                 cursor=cursor,
                 batch=batch,
@@ -436,6 +1460,10 @@ class CollectionArrowLoaderParallel(CollectionLoaderParallel):
 
         projection_op = self._projection_op(projection)
 
+        if self.pipeline:
+            # an aggregation runs when it's created, leave it to the worker of the batch
+            return partial(self._pipeline_op, filter_op, projection_op)
+
         cursor = self.collection.find_raw_batches(
             filter=filter_op, batch_size=self.chunk_size, projection=projection_op
         )
@@ -444,25 +1472,50 @@ class CollectionArrowLoaderParallel(CollectionLoaderParallel):
 
         return cursor
 
+    def _aggregate(self, pipeline: List[Dict[str, Any]]) -> TCursor:
+        return self.collection.aggregate_raw_batches(
+            pipeline, batchSize=self.chunk_size
+        )
+
     @dlt.defer
     def _run_batch(
         self,
         cursor: TCursor,
-        batch: Dict[str, int],
+        batch: Dict[str, Any],
         pymongoarrow_schema: Any = None,
     ) -> TDataItem:
         from pymongoarrow.context import PyMongoArrowContext
         from pymongoarrow.lib import process_bson_stream
 
-        cursor = cursor.clone()
+        cursor = self._batch_cursor(cursor, batch)
 
+        # fetch, decode and convert the whole batch here and return the table,
+        # a generator would leave all that work to the main thread
         context = PyMongoArrowContext.from_schema(
             schema=pymongoarrow_schema, codec_options=self.collection.codec_options
         )
-        for chunk in cursor.skip(batch["skip"]).limit(batch["limit"]):
+        if self.chunk_bytes:
+            return iter(list(self._decode_arrow_chunks(cursor, context)))
+
+        bytes_, fetch_s, decode_s = 0, 0.0, 0.0
+        for chunk, chunk_fetch_s in _timed(cursor):
+            started_at = time.perf_counter()
             process_bson_stream(chunk, context)
-            table = context.finish()
-            yield convert_arrow_columns(table)
+            decode_s += time.perf_counter() - started_at
+            bytes_, fetch_s = bytes_ + len(chunk), fetch_s + chunk_fetch_s
+        started_at = time.perf_counter()
+        table = context.finish()
+        decoded_at = time.perf_counter()
+        table = convert_arrow_columns(table)
+        self.metrics.add_batch(
+            table.num_rows,
+            bytes_=bytes_,
+            fetch_s=fetch_s,
+            decode_s=decode_s + decoded_at - started_at,
+            convert_s=time.perf_counter() - decoded_at,
+        )
+
+        return table
 
 
 def collection_documents(
@@ -475,7 +1528,16 @@ def collection_documents(
     parallel: bool = False,
     limit: Optional[int] = None,
     chunk_size: Optional[int] = 10000,
-    data_item_format: Optional[TDataItemFormat] = "object",
+    data_item_format: Optional[TMongoDataItemFormat] = "object",
+    batch_strategy: TBatchStrategy = "skip",
+    decode_processes: Optional[int] = 0,
+    decode_queue_depth: Optional[int] = None,
+    chunk_bytes: Optional[int] = None,
+    pipeline: Optional[List[Dict[str, Any]]] = None,
+    explain: Optional[bool] = False,
+    skip_unindexed_sort: Optional[bool] = False,
+    loader_strategy: Optional[TLoaderStrategy] = "manual",
+    checkpoint: Optional[bool] = False,
 ) -> Iterator[TDataItem]:
     """
     A DLT source which loads data from a Mongo database using PyMongo.
@@ -492,39 +1554,128 @@ def collection_documents(
                 exclude (dict) - {"released": False, "runtime": False}
             Note: Can't mix include and exclude statements '{"title": True, "released": False}`
         pymongoarrow_schema (pymongoarrow.schema.Schema): The mapping of field types to convert BSON to Arrow.
+            Pass "auto" to infer it from a sample of the collection and cache it on disk.
         incremental (Optional[dlt.sources.incremental[Any]]): The incremental configuration.
         parallel (bool): Option to enable parallel loading for the collection. Default is False.
         limit (Optional[int]): The maximum number of documents to load.
         chunk_size (Optional[int]): The number of documents to load in each batch.
-        data_item_format (Optional[TDataItemFormat]): The data format to use for loading.
+        data_item_format (Optional[TMongoDataItemFormat]): The data format to use for loading.
             Supported formats:
                 object - Python objects (dicts, lists).
                 arrow - Apache Arrow tables.
+                parquet - Parquet files written from the raw BSON batches and imported as they are.
+        batch_strategy (TBatchStrategy): How parallel loading splits the collection into batches.
+            Supported strategies:
+                skip - `skip`/`limit` windows over a single query.
+                range - indexed `$gte`/`$lt` ranges of `_id` (or the incremental cursor field).
+                keyset - the same ranges, bounded lazily while loading, without counting the documents.
+        decode_processes (Optional[int]): The number of worker processes decoding the documents of
+            the object format, 0 decodes them in this process. Takes precedence over `parallel`.
+        decode_queue_depth (Optional[int]): The number of batches sent to the decoding processes
+            ahead of the one being yielded, twice `decode_processes` by default.
+        chunk_bytes (Optional[int]): The maximum size of a batch in bytes of BSON, `chunk_size`
+            stays the maximum number of documents. Parallel batches are sized from the average
+            document size of the collection and split at document boundaries like the others.
+        pipeline (Optional[List[Dict[str, Any]]]): The aggregation stages to run on the server in place
+            of `find()`, after the filter, incremental window, batch range and projection.
+        explain (Optional[bool]): Explain the query before loading and store the plan in the
+            resource state under `query_plan`, see `CollectionLoader.plan_query`.
+        skip_unindexed_sort (Optional[bool]): Drop the sort on the incremental cursor field if no
+            index provides it, the query is explained to find out.
+        loader_strategy (Optional[TLoaderStrategy]): "auto" picks `parallel`, `batch_strategy`,
+            `data_item_format` and `chunk_size` from the collection stats, see `auto_loader_settings`.
+        checkpoint (Optional[bool]): Stage the documents in Parquet files and resume a failed
+            extract after the last finished file, see `CollectionParquetLoader`.
+
+    The counters of the load (see `ExtractionMetrics`) are stored in the resource state
+    under `extraction_metrics`.
 
     Returns:
         Iterable[DltResource]: A list of DLT resources for each collection to be loaded.
     """
-    if data_item_format == "arrow" and not PYMONGOARROW_AVAILABLE:
+    if loader_strategy == "auto":
+        settings = auto_loader_settings(
+            collection,
+            chunk_size,
+            cursor_field=incremental.cursor_path if incremental else None,
+            pipeline=pipeline,
+            arrow_available=PYMONGOARROW_AVAILABLE,
+        )
+        parallel = settings["parallel"]
+        batch_strategy = settings["batch_strategy"]
+        data_item_format = settings["data_item_format"]
+        chunk_size = settings["chunk_size"]
+
+    if data_item_format in ("arrow", "parquet") and not PYMONGOARROW_AVAILABLE:
         dlt.common.logger.warn(
             "'pymongoarrow' is not installed; falling back to standard MongoDB CollectionLoader."
         )
         data_item_format = "object"
 
-    if data_item_format != "arrow" and pymongoarrow_schema:
+    if data_item_format == "parquet" and incremental:
+        dlt.common.logger.warn(
+            "The rows of imported Parquet files aren't visible to `incremental`, "
+            "falling back to `data_item_format=='arrow'`."
+        )
+        data_item_format = "arrow"
+
+    if checkpoint and (incremental or pipeline or data_item_format == "object"):
+        dlt.common.logger.warn(
+            "Received value for `checkpoint`, but it needs `data_item_format` 'arrow' or "
+            "'parquet' without `incremental` and `pipeline`. `checkpoint` will be ignored."
+        )
+        checkpoint = False
+
+    if checkpoint and data_item_format == "arrow":
+        # the checkpointed documents are kept in the staged Parquet files
+        data_item_format = "parquet"
+
+    if data_item_format == "parquet" and not pymongoarrow_schema:
+        # all the files of a load need the same schema
+        pymongoarrow_schema = "auto"
+
+    if pymongoarrow_schema == "auto":
+        pymongoarrow_schema = (
+            auto_pymongoarrow_schema(collection, pipeline=pipeline)
+            if data_item_format != "object"
+            else None
+        )
+
+    if data_item_format == "object" and pymongoarrow_schema:
         dlt.common.logger.warn(
             "Received value for `pymongoarrow_schema`, but `data_item_format=='object'` "
             "Use `data_item_format=='arrow'` to enforce schema."
         )
 
-    if data_item_format == "arrow" and pymongoarrow_schema and projection:
+    if (
+        data_item_format != "object"
+        and pymongoarrow_schema
+        and projection
+        and not pipeline
+    ):
         dlt.common.logger.warn(
             "Received values for both `pymongoarrow_schema` and `projection`. Since both "
             "create a projection to select fields, `projection` will be ignored."
         )
 
-    if parallel:
+    if data_item_format != "object" and pymongoarrow_schema and not pipeline:
+        # let the server send only the fields of the schema
+        projection = pymongoarrow_schema._get_projection()
+
+    if decode_processes and data_item_format != "object":
+        dlt.common.logger.warn(
+            f"Received value for `decode_processes`, but `data_item_format=='{data_item_format}'` "
+            "decodes in the native pymongoarrow code. `decode_processes` will be ignored."
+        )
+        decode_processes = 0
+
+    if data_item_format == "parquet":
+        LoaderClass = CollectionParquetLoader
+    elif decode_processes:
+        LoaderClass = CollectionLoaderProcessPool  # type: ignore
+    elif parallel:
         if data_item_format == "arrow":
-            LoaderClass = CollectionArrowLoaderParallel
+            LoaderClass = CollectionArrowLoaderParallel  # type: ignore
         else:
             LoaderClass = CollectionLoaderParallel  # type: ignore
     else:
@@ -533,9 +1684,60 @@ def collection_documents(
         else:
             LoaderClass = CollectionLoader  # type: ignore
 
-    loader = LoaderClass(
-        client, collection, incremental=incremental, chunk_size=chunk_size
-    )
+    if decode_processes:
+        loader = LoaderClass(
+            client,
+            collection,
+            incremental=incremental,
+            chunk_size=chunk_size,
+            workers=decode_processes,
+            queue_depth=decode_queue_depth,
+            chunk_bytes=chunk_bytes,
+            pipeline=pipeline,
+        )
+    elif data_item_format == "parquet":
+        loader = LoaderClass(
+            client,
+            collection,
+            incremental=incremental,
+            chunk_size=chunk_size,
+            chunk_bytes=chunk_bytes,
+            pipeline=pipeline,
+            checkpoint=bool(checkpoint),
+        )
+    elif parallel:
+        loader = LoaderClass(
+            client,
+            collection,
+            incremental=incremental,
+            chunk_size=chunk_size,
+            batch_strategy=batch_strategy,
+            chunk_bytes=chunk_bytes,
+            pipeline=pipeline,
+        )
+    else:
+        loader = LoaderClass(
+            client,
+            collection,
+            incremental=incremental,
+            chunk_size=chunk_size,
+            chunk_bytes=chunk_bytes,
+            pipeline=pipeline,
+        )
+    # named, the body of a `parallelized` resource runs on a pool thread that
+    # has no current resource
+    state = dlt.current.resource_state(collection.name)
+    if explain or skip_unindexed_sort:
+        plan = loader.plan_query(
+            filter_, limit, projection, skip_unindexed_sort=bool(skip_unindexed_sort)
+        )
+        logger.info(f"Query plan of `{collection.name}`: {plan}")
+        state["query_plan"] = plan
+
+    # the counters of this load replace the ones of the previous run
+    loader.metrics.state = state
+    loader.metrics.state.pop("extraction_metrics", None)
+
     if isinstance(loader, (CollectionArrowLoader, CollectionArrowLoaderParallel)):
         yield from loader.load_documents(
             limit=limit,
@@ -549,6 +1751,119 @@ def collection_documents(
         )
 
 
+def database_collection_documents(
+    connection_url: str,
+    database: Optional[str],
+    collection: str,
+    incremental: Optional[dlt.sources.incremental[Any]] = None,
+    **kwargs: Any,
+) -> Iterator[TDataItem]:
+    """
+    Same as `collection_documents`, with the client and the collection looked up when the
+    resource is extracted. Building the resource doesn't connect to the database, so a
+    source can be declared at import time, e.g. in a Dagster code location.
+
+    Args:
+        connection_url (str): Database connection_url.
+        database (Optional[str]): Selected database name, it will use the default database if not passed.
+        collection (str): The collection name to load.
+        incremental (Optional[dlt.sources.incremental[Any]]): The incremental configuration.
+        **kwargs: The other arguments of `collection_documents`.
+
+    Returns:
+        Iterable[DltResource]: A list of DLT resources for each collection to be loaded.
+    """
+    client = client_from_credentials(connection_url)
+    if not database:
+        mongo_database = client.get_default_database()
+    else:
+        mongo_database = client[database]
+
+    yield from collection_documents(
+        client, mongo_database[collection], incremental=incremental, **kwargs
+    )
+
+
+def collection_changes(
+    client: TMongoClient,
+    collection: TCollection,
+    chunk_size: Optional[int] = 10000,
+    max_await_time_ms: Optional[int] = 1000,
+) -> Iterator[TDataItem]:
+    """
+    A DLT resource which loads the changes of a collection from its change stream.
+
+    Picks up the stream at the resume token stored in the resource state and reads
+    the changes until the stream stays idle for `max_await_time_ms`. The resume token
+    is stored with each chunk, so the next run continues where this one stopped. The
+    first run (no resume token) only marks the position to start from, load the
+    current documents with `mongodb_collection` beforehand.
+
+    Inserts, replaces and updates yield the full document. Deletes yield the `_id`
+    with `_change_deleted` set. `_change_seq` orders the changes of a document.
+
+    Args:
+        client (MongoClient): The PyMongo client `pymongo.MongoClient` instance.
+        collection (Collection): The collection `pymongo.collection.Collection` to watch.
+        chunk_size (Optional[int]): The number of changes to load in each batch.
+        max_await_time_ms (Optional[int]): How long to wait for new changes before stopping.
+
+    Yields:
+        Iterator[TDataItem]: An iterator of the changed documents.
+    """
+    state = dlt.current.resource_state()
+    conversion_plan = ConversionPlan()
+
+    with collection.watch(
+        full_document="updateLookup",
+        resume_after=state.get("resume_token"),
+        max_await_time_ms=max_await_time_ms,
+        batch_size=chunk_size,
+    ) as stream:
+        chunk: List[TDataItem] = []
+        while change := stream.try_next():
+            if change["operationType"] == "invalidate":
+                logger.warning(
+                    f"The change stream of `{collection.name}` was invalidated (the collection was "
+                    "dropped or renamed). The next run starts from the current time."
+                )
+                state.pop("resume_token", None)
+                break
+
+            document = _change_to_document(change)
+            if document is not None:
+                chunk.append(document)
+
+            if len(chunk) >= chunk_size:
+                # stored before yielding, so the state matches the chunks extracted
+                # even if the resource is closed after this chunk
+                state["resume_token"] = stream.resume_token
+                yield conversion_plan.convert(chunk)
+                chunk = []
+        else:
+            state["resume_token"] = stream.resume_token
+
+        if chunk:
+            yield conversion_plan.convert(chunk)
+
+
+def _change_to_document(change: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Get the document to load from a change stream event, `None` if there's none."""
+    operation = change["operationType"]
+    if operation in ("insert", "replace", "update"):
+        # `update` events have no full document if it was deleted since
+        document = change.get("fullDocument")
+    elif operation == "delete":
+        document = {"_id": change["documentKey"]["_id"], "_change_deleted": True}
+    else:
+        return None
+
+    if document is not None:
+        cluster_time = change["clusterTime"]
+        document["_change_seq"] = (cluster_time.time << 32) | cluster_time.inc
+    return document
+
+
 def convert_mongo_objs(value: Any) -> Any:
     """MongoDB to dlt type conversion when using Python loaders.
 
@@ -569,20 +1884,152 @@ def convert_mongo_objs(value: Any) -> Any:
     return value
 
 
+class ConversionPlan:
+    """MongoDB to dlt type conversion of documents along a precompiled plan.
+
+    The plan is compiled from the BSON types of a sample document of the collection.
+    It visits the containers and the values that need a conversion, the plain
+    scalars of each container are checked at once against the types seen in the
+    sample. Containers which don't match the plan are converted with the generic
+    `map_nested_in_place(convert_mongo_objs, ...)` walk, and the plan is compiled
+    again when most documents of a batch have different fields than the sample.
+    """
+
+    def __init__(self) -> None:
+        self._plan: Optional[Tuple[Tuple[str, ...], Callable[[Any], Any]]] = None
+
+    def convert(self, documents: List[TDataItem]) -> List[TDataItem]:
+        """Convert a batch of documents in place.
+
+        Args:
+            documents (List[TDataItem]): The documents to convert.
+
+        Returns:
+            List[TDataItem]: The converted documents.
+        """
+        if not documents:
+            return documents
+
+        plan, sample = self._plan, documents[0]
+        if plan is not None:
+            keys = plan[0]
+            mismatches = [document for document in documents if tuple(document) != keys]
+            if len(mismatches) * 2 > len(documents):
+                plan, sample = None, mismatches[0]
+
+        if plan is None:
+            plan = self._plan = (tuple(sample), _compile_dict_conversion(sample))
+
+        convert_document = plan[1]
+        for i, document in enumerate(documents):
+            documents[i] = convert_document(document)
+        return documents
+
+
+# types `convert_mongo_objs` returns unchanged
+_PLAIN_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _convert_nested(value: Any) -> Any:
+    """Convert a value which doesn't match the conversion plan."""
+    if isinstance(value, (dict, list)):
+        return map_nested_in_place(convert_mongo_objs, value)
+    return convert_mongo_objs(value)
+
+
+def _compile_conversion(value: Any) -> Optional[Callable[[Any], Any]]:
+    """Compile the conversion of values shaped like `value`, `None` if there's nothing to convert."""
+    type_ = type(value)
+    if type_ is dict:
+        return _compile_dict_conversion(value)
+    if type_ is list:
+        return _compile_list_conversion(value)
+    if type_ in _PLAIN_TYPES:
+        return None
+    if type_ is _datetime.datetime:
+        return _datetime_to_pendulum
+    if type_ is ObjectId or type_ is Decimal128:
+        return str
+    return convert_mongo_objs
+
+
+def _datetime_to_pendulum(value: _datetime.datetime) -> pendulum.DateTime:
+    """Same as `ensure_pendulum_datetime()` for datetimes, without its generic checks."""
+    if value.tzinfo is not None:
+        value = value.astimezone(_datetime.timezone.utc)
+    return pendulum.DateTime(
+        value.year,
+        value.month,
+        value.day,
+        value.hour,
+        value.minute,
+        value.second,
+        value.microsecond,
+        tzinfo=pendulum.UTC,
+    )
+
+
+def _compile_dict_conversion(document: Dict[str, Any]) -> Callable[[Any], Any]:
+    keys = tuple(document)
+    types = tuple(map(type, document.values()))
+    steps = [
+        (key, convert)
+        for key, value in document.items()
+        if (convert := _compile_conversion(value)) is not None
+    ]
+
+    def convert_dict(value: Any) -> Any:
+        if (
+            type(value) is not dict
+            or tuple(value) != keys
+            or tuple(map(type, value.values())) != types
+        ):
+            return _convert_nested(value)
+
+        for key, convert in steps:
+            value[key] = convert(value[key])
+        return value
+
+    return convert_dict
+
+
+def _compile_list_conversion(items: List[Any]) -> Callable[[Any], Any]:
+    item_types = set(map(type, items))
+
+    if item_types <= _PLAIN_TYPES:
+
+        def convert_plain_list(value: Any) -> Any:
+            if type(value) is list and set(map(type, value)) <= _PLAIN_TYPES:
+                return value
+            return _convert_nested(value)
+
+        return convert_plain_list
+
+    if item_types == {dict}:
+        convert_item = _compile_dict_conversion(items[0])
+
+        def convert_list(value: Any) -> Any:
+            if type(value) is not list:
+                return _convert_nested(value)
+
+            for i, item in enumerate(value):
+                value[i] = convert_item(item)
+            return value
+
+        return convert_list
+
+    return _convert_nested
+
+
 def convert_arrow_columns(table: Any) -> Any:
     """Convert the given table columns to Python types.
 
     Notes:
-        Calling str() matches the `convert_mongo_obs()` used in non-arrow code.
-        Pymongoarrow converts ObjectId to `fixed_size_binary[12]`, which can't be
-        converted to a string as a vectorized operation because it contains ASCII characters.
-
-        Instead, you need to loop over values using:
-        ```python
-        pyarrow.array([v.as_buffer().hex() for v in object_id_array], type=pyarrow.string())
-        # pymongoarrow simplifies this by allowing this syntax
-        [str(v) for v in object_id_array]
-        ```
+        The strings match `str()` as called by `convert_mongo_objs()` in non-arrow code.
+        Pymongoarrow converts ObjectId to `fixed_size_binary[12]` and Decimal128 to
+        `fixed_size_binary[16]` extension types. Both are converted to strings with
+        whole-array operations on their buffers, see `_objectid_to_str()` and
+        `_decimal128_to_str()`. Binary and code columns keep their storage arrays.
 
     Args:
         table (pyarrow.lib.Table): The table to convert.
@@ -594,37 +2041,249 @@ def convert_arrow_columns(table: Any) -> Any:
     from dlt.common.libs.pyarrow import pyarrow
 
     for i, field in enumerate(table.schema):
-        if _is_objectid(field.type) or _is_decimal128(field.type):
-            col_values = [str(value) for value in table[field.name]]
-            table = table.set_column(
-                i,
-                pyarrow.field(field.name, pyarrow.string()),
-                pyarrow.array(col_values, type=pyarrow.string()),
-            )
+        if _is_objectid(field.type):
+            convert_chunk, type_ = _objectid_to_str, pyarrow.string()
+        elif _is_decimal128(field.type):
+            convert_chunk, type_ = _decimal128_to_str, pyarrow.string()
+        elif _is_binary(field.type):
+            convert_chunk, type_ = _storage, pyarrow.binary()
+        elif _is_code(field.type):
+            convert_chunk, type_ = _storage, pyarrow.string()
         else:
-            type_ = None
-            if _is_binary(field.type):
-                type_ = pyarrow.binary()
-            elif _is_code(field.type):
-                type_ = pyarrow.string()
-
-            if type_:
-                col_values = [value.as_py() for value in table[field.name]]
-                table = table.set_column(
-                    i,
-                    pyarrow.field(field.name, type_),
-                    pyarrow.array(col_values, type=type_),
-                )
+            continue
+
+        column = pyarrow.chunked_array(
+            [convert_chunk(chunk) for chunk in table[field.name].chunks], type=type_
+        )
+        table = table.set_column(i, pyarrow.field(field.name, type_), column)
     return table
 
 
-def client_from_credentials(connection_url: str) -> TMongoClient:
-    client: TMongoClient = MongoClient(
-        connection_url, uuidRepresentation="standard", tz_aware=True
+def _storage(array: Any) -> Any:
+    """Get the storage array of a pymongoarrow extension array."""
+    return array.storage
+
+
+def _fixed_size_values(array: Any, width: int) -> Any:
+    """View the values of a `fixed_size_binary[width]` array as a 2D numpy array."""
+    import numpy as np
+
+    return np.frombuffer(
+        array.buffers()[1],
+        dtype=np.uint8,
+        count=len(array) * width,
+        offset=array.offset * width,
+    ).reshape(len(array), width)
+
+
+def _string_array_from_chars(chars: Any, keep: Any, valid: Any) -> Any:
+    """Build a string array from a 2D numpy array of ASCII characters.
+
+    Args:
+        chars (numpy.ndarray): The characters of each row.
+        keep (numpy.ndarray): The mask of the characters belonging to each row's string.
+        valid (pyarrow.Array): The validity of each row.
+
+    Returns:
+        pyarrow.StringArray: The strings, null where `valid` is false.
+    """
+    import numpy as np
+    from dlt.common.libs.pyarrow import pyarrow
+
+    offsets = np.zeros(len(chars) + 1, dtype=np.int32)
+    np.cumsum(keep.sum(axis=1), out=offsets[1:])
+    strings = pyarrow.StringArray.from_buffers(
+        len(chars), pyarrow.py_buffer(offsets), pyarrow.py_buffer(chars[keep])
+    )
+    if valid.null_count:
+        strings = pyarrow.compute.if_else(
+            valid.is_valid(), strings, pyarrow.scalar(None, pyarrow.string())
+        )
+    return strings
+
+
+def _objectid_to_str(array: Any) -> Any:
+    """Hex-encode an ObjectId extension array as a whole-array operation."""
+    import numpy as np
+    from dlt.common.libs.pyarrow import pyarrow
+
+    storage = array.storage
+    if len(storage) == 0:
+        return pyarrow.array([], type=pyarrow.string())
+
+    hex_digits = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+    values = _fixed_size_values(storage, 12)
+    chars = np.empty((len(values), 24), dtype=np.uint8)
+    chars[:, 0::2] = hex_digits[values >> 4]
+    chars[:, 1::2] = hex_digits[values & 0x0F]
+
+    return _string_array_from_chars(chars, np.ones(chars.shape, dtype=bool), storage)
+
+
+def _decimal128_to_str(array: Any) -> Any:
+    """Convert a Decimal128 extension array to the strings `str(Decimal128)` returns.
+
+    The BID encoded values are decoded with numpy. Finite values with a coefficient
+    below 2**64 that `decimal.Decimal` prints without an exponent, which covers
+    amounts and prices in practice, are formatted as a whole-array operation.
+    The other values (NaN, infinity, huge coefficients, scientific notation) are
+    converted one by one.
+    """
+    import numpy as np
+    from dlt.common.libs.pyarrow import pyarrow
+
+    storage = array.storage
+    if len(storage) == 0:
+        return pyarrow.array([], type=pyarrow.string())
+
+    values = _fixed_size_values(storage, 16)
+    words = values.view("<u8")
+    low, high = words[:, 0], words[:, 1]
+
+    negative = (high >> np.uint64(63)).astype(bool)
+    exponent = ((high >> np.uint64(49)) & np.uint64(0x3FFF)).astype(np.int64) - 6176
+    digit_count = np.ones(len(low), dtype=np.int64)
+    for power in range(1, 20):
+        digit_count += low >= np.uint64(10**power)
+
+    combination_mask = np.uint64(3 << 61)
+    high_coefficient_mask = np.uint64((1 << 49) - 1)
+    fast = (
+        ((high & combination_mask) != combination_mask)
+        & ((high & high_coefficient_mask) == 0)
+        & (exponent <= 0)
+        & (exponent + digit_count - 1 >= -6)
+    )
+
+    # the coefficient digits right aligned and zero padded to the widest fast value
+    width = int(
+        max(
+            digit_count.max(initial=1, where=fast),
+            1 - exponent.min(initial=0, where=fast),
+        )
+    )
+    digits = np.empty((len(low), width), dtype=np.uint8)
+    remainder = low.copy()
+    for column in range(width - 1, -1, -1):
+        digits[:, column] = remainder % np.uint64(10) + np.uint64(ord("0"))
+        remainder //= np.uint64(10)
+
+    # insert the decimal point before the last `-exponent` digits
+    fraction_len = np.where(fast, -exponent, 0)[:, None]
+    point = width - fraction_len
+    column = np.arange(width + 1)[None, :]
+    padding = np.full((len(low), 1), ord("0"), dtype=np.uint8)
+    body = np.where(
+        column < point,
+        np.concatenate([digits, padding], axis=1),
+        np.where(
+            column == point, ord("."), np.concatenate([padding, digits], axis=1)
+        ),
+    ).astype(np.uint8)
+    integer_len = np.maximum(digit_count[:, None] - fraction_len, 1)
+    keep = (column >= point - integer_len) & ((column != point) | (fraction_len > 0))
+
+    chars = np.concatenate(
+        [np.full((len(low), 1), ord("-"), dtype=np.uint8), body], axis=1
+    )
+    keep = np.concatenate([negative[:, None], keep], axis=1) & fast[:, None]
+    strings = _string_array_from_chars(chars, keep, storage)
+
+    slow = ~fast & storage.is_valid().to_numpy(zero_copy_only=False)
+    if slow.any():
+        strings = pyarrow.compute.replace_with_mask(
+            strings,
+            pyarrow.array(slow),
+            pyarrow.array(
+                [
+                    str(Decimal128.from_bid(value.tobytes()))
+                    for value in values[slow]
+                ],
+                type=pyarrow.string(),
+            ),
+        )
+    return strings
+
+
+def _get_path(document: Dict[str, Any], path: str) -> Any:
+    """Get the value of a dotted `path` from a document, `None` if missing."""
+    value: Any = document
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+
+    return value
+
+
+# clients shared by the resources of this process, see `client_from_credentials`
+_clients: Dict[Tuple[Any, ...], TMongoClient] = {}
+_clients_lock = threading.Lock()
+
+
+def _collect_plan_stages(plan: Any, stages: List[str], indexes: List[str]) -> None:
+    """Collect the stages and index names of the winning plans in an explain output."""
+    if isinstance(plan, list):
+        for item in plan:
+            _collect_plan_stages(item, stages, indexes)
+    elif isinstance(plan, dict):
+        for key, value in plan.items():
+            if key == "rejectedPlans":
+                continue
+            if key == "stage" and isinstance(value, str):
+                stages.append(value)
+            elif key == "indexName" and isinstance(value, str):
+                indexes.append(value)
+            else:
+                _collect_plan_stages(value, stages, indexes)
+
+
+def client_configuration() -> "MongoDbClientConfiguration":
+    """Resolve the client options from the `sources.mongodb.client` config section."""
+    return resolve_configuration(
+        MongoDbClientConfiguration(), sections=("sources", "mongodb", "client")
     )
+
+
+def client_from_credentials(connection_url: str) -> TMongoClient:
+    """Get the client of a connection url, shared by all the resources of the process.
+
+    The pool size, wire compressors and read preference are taken from the
+    `sources.mongodb.client` config section, a client is created for each
+    distinct set of options. The clients are closed when the process exits.
+
+    Args:
+        connection_url (str): Database connection_url.
+
+    Returns:
+        MongoClient: The PyMongo client `pymongo.MongoClient` instance.
+    """
+    config = client_configuration()
+    options: Dict[str, Any] = dict(uuidRepresentation="standard", tz_aware=True)
+    if config.max_pool_size:
+        options["maxPoolSize"] = config.max_pool_size
+    if config.compressors:
+        options["compressors"] = ",".join(config.compressors)
+    if config.read_preference:
+        options["readPreference"] = config.read_preference
+
+    # a forked process can't use the connections of its parent
+    key = (os.getpid(), connection_url, tuple(sorted(options.items())))
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = MongoClient(connection_url, **options)
     return client
 
 
+@atexit.register
+def _close_clients() -> None:
+    with _clients_lock:
+        while _clients:
+            _, client = _clients.popitem()
+            client.close()
+
+
 def _raise_if_intersection(filter1: Dict[str, Any], filter2: Dict[str, Any]) -> None:
     """
     Raise an exception, if the given filters'
@@ -646,6 +2305,14 @@ def _raise_if_intersection(filter1: Dict[str, Any], filter2: Dict[str, Any]) ->
             )
 
 
+@configspec
+class MongoDbClientConfiguration(BaseConfiguration):
+    max_pool_size: Optional[int] = None
+    compressors: Optional[List[str]] = None
+    read_preference: Optional[str] = None
+    batch_size: Optional[int] = None
+
+
 @configspec
 class MongoDbCollectionConfiguration(BaseConfiguration):
     incremental: Optional[dlt.sources.incremental] = None  # type: ignore[type-arg]
@@ -659,7 +2326,25 @@ class MongoDbCollectionResourceConfiguration(BaseConfiguration):
     incremental: Optional[dlt.sources.incremental] = None  # type: ignore[type-arg]
     write_disposition: Optional[str] = dlt.config.value
     parallel: Optional[bool] = False
+    batch_strategy: Optional[TBatchStrategy] = "skip"
+    decode_processes: Optional[int] = 0
+    decode_queue_depth: Optional[int] = None
+    chunk_bytes: Optional[int] = None
+    pipeline: Optional[List[Dict[str, Any]]] = None
+    explain: Optional[bool] = False
+    skip_unindexed_sort: Optional[bool] = False
+    loader_strategy: Optional[TLoaderStrategy] = "manual"
+    checkpoint: Optional[bool] = False
     projection: Optional[Union[Mapping[str, Any], Iterable[str]]] = dlt.config.value
 
 
+@configspec
+class MongoDbChangeStreamResourceConfiguration(BaseConfiguration):
+    connection_url: dlt.TSecretValue = dlt.secrets.value
+    database: Optional[str] = dlt.config.value
+    collection: str = dlt.config.value
+    chunk_size: Optional[int] = 10000
+    max_await_time_ms: Optional[int] = 1000
+
+
 __source_name__ = "mongodb"
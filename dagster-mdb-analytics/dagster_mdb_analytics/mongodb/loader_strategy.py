@@ -0,0 +1,147 @@
+"""Choice of the collection loader from the collection statistics"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import dlt
+from dlt.common import logger
+from dlt.common.configuration.specs import BaseConfiguration, configspec
+from dlt.common.configuration.specs.base_configuration import extract_inner_hint
+from dlt.common.configuration.utils import deserialize_value
+from pymongo.errors import OperationFailure
+
+# number of documents sampled to find out how deeply they are nested
+AUTO_SAMPLE_SIZE = 100
+
+# collections with fewer documents are loaded by a single cursor
+AUTO_PARALLEL_MIN_DOCUMENTS = 500_000
+
+# bytes of BSON fetched, decoded and converted at once
+AUTO_CHUNK_BYTES = 16 * 1024 * 1024
+AUTO_MIN_CHUNK_SIZE = 1_000
+AUTO_MAX_CHUNK_SIZE = 100_000
+
+
+@configspec
+class MongoDbLoaderConfiguration(BaseConfiguration):
+    parallel: Optional[bool] = None
+    batch_strategy: Optional[str] = None
+    data_item_format: Optional[str] = None
+    chunk_size: Optional[int] = None
+
+
+def auto_loader_settings(
+    collection: Any,
+    chunk_size: int,
+    cursor_field: Optional[str] = None,
+    pipeline: Optional[List[Dict[str, Any]]] = None,
+    arrow_available: bool = True,
+) -> Dict[str, Any]:
+    """Pick the loader of a collection from its statistics, indexes and a sample.
+
+    * Collections of `AUTO_PARALLEL_MIN_DOCUMENTS` or more are loaded in parallel `range`
+      batches when the split field (`cursor_field` or `_id`) is indexed, serially otherwise.
+    * Flat documents are loaded as Arrow tables. Documents with arrays or embedded documents
+      stay objects, so they keep landing in child tables rather than JSON columns.
+    * The chunk size fits `AUTO_CHUNK_BYTES` of BSON from the average document size.
+
+    Any setting found in the `sources.mongodb.loader.<collection>` config section replaces
+    the automatic choice, see `_config_overrides`.
+
+    Args:
+        collection (Collection): The collection `pymongo.collection.Collection` to load.
+        chunk_size (int): The chunk size kept when the average document size isn't known.
+        cursor_field (Optional[str]): The incremental cursor field, the parallel batches
+            are split on it.
+        pipeline (Optional[List[Dict[str, Any]]]): The aggregation stages the documents are
+            loaded with, the nesting is looked up in their output.
+        arrow_available (bool): Whether pymongoarrow is installed.
+
+    Returns:
+        Dict[str, Any]: `parallel`, `batch_strategy`, `data_item_format` and `chunk_size`.
+    """
+    documents, avg_size = _collection_stats(collection)
+    depth = max(
+        (
+            _nesting_depth(document)
+            for document in collection.aggregate(
+                [{"$sample": {"size": AUTO_SAMPLE_SIZE}}, *(pipeline or [])]
+            )
+        ),
+        default=1,
+    )
+    split_field = cursor_field or "_id"
+    indexed = split_field == "_id" or any(
+        keys[0][0] == split_field for keys in _index_keys(collection)
+    )
+
+    parallel = documents >= AUTO_PARALLEL_MIN_DOCUMENTS and indexed
+    settings: Dict[str, Any] = {
+        "parallel": parallel,
+        "batch_strategy": "range" if parallel else "skip",
+        "data_item_format": "arrow" if depth == 1 and arrow_available else "object",
+        "chunk_size": (
+            max(AUTO_MIN_CHUNK_SIZE, min(AUTO_MAX_CHUNK_SIZE, AUTO_CHUNK_BYTES // avg_size))
+            if avg_size
+            else chunk_size
+        ),
+    }
+
+    overrides = _config_overrides(collection.name)
+    settings.update(overrides)
+
+    logger.info(
+        f"Loader of `{collection.name}`: {settings} from {documents} documents of "
+        f"{avg_size or 'unknown'} bytes on average, nesting depth {depth}, "
+        f"`{split_field}` {'indexed' if indexed else 'not indexed'}"
+        + (f", overridden by config: {sorted(overrides)}" if overrides else "")
+    )
+    return settings
+
+
+def _config_overrides(collection_name: str) -> Dict[str, Any]:
+    """The `MongoDbLoaderConfiguration` settings in `sources.mongodb.loader.<collection>`.
+
+    Only that exact section is looked up: `resolve_configuration` falls back to the
+    enclosing sections, where the source arguments of the same names (`chunk_size`,
+    `parallel`, ...) would override the automatic choice of every collection.
+    """
+    sections = ("sources", "mongodb", "loader", collection_name)
+    overrides: Dict[str, Any] = {}
+    for key, hint in MongoDbLoaderConfiguration().get_resolvable_fields().items():
+        for provider in dlt.config.config_providers:
+            value, _ = provider.get_value(key, hint, None, *sections)
+            if value is not None:
+                overrides[key] = deserialize_value(key, value, extract_inner_hint(hint))
+                break
+    return overrides
+
+
+def _collection_stats(collection: Any) -> Tuple[int, Optional[int]]:
+    """The number of documents and their average size, from `$collStats` if allowed."""
+    try:
+        stats = next(
+            collection.aggregate([{"$collStats": {"storageStats": {}}}]), None
+        )
+    except OperationFailure as exc:
+        logger.warning(
+            f"Can't read the storage stats of `{collection.name}`, "
+            f"the loader is chosen from the estimated document count: {exc}"
+        )
+        return collection.estimated_document_count(), None
+
+    storage_stats = (stats or {}).get("storageStats", {})
+    avg_size = storage_stats.get("avgObjSize")
+    return int(storage_stats.get("count", 0)), int(avg_size) if avg_size else None
+
+
+def _index_keys(collection: Any) -> List[List[Any]]:
+    return [index["key"] for index in collection.index_information().values()]
+
+
+def _nesting_depth(value: Any) -> int:
+    """1 for a flat document, more for each level of embedded documents or arrays."""
+    if isinstance(value, dict):
+        return 1 + max(map(_nesting_depth, value.values()), default=0)
+    if isinstance(value, list):
+        return 1 + max(map(_nesting_depth, value), default=0)
+    return 0
@@ -1,9 +1,139 @@
-from dagster import EnvVar 
+from typing import Any, Iterable, Iterator, List, Mapping, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from dagster import AssetExecutionContext, EnvVar, OpExecutionContext
 
 from dagster_embedded_elt.dlt import DagsterDltResource
 from dagster_snowflake import SnowflakeResource
+from dlt import Pipeline
+from dlt.common.pipeline import LoadInfo
+from dlt.extract.resource import DltResource
+
+# string columns with at most this share of distinct values become categories
+CATEGORY_MAX_RATIO = 0.5
+
+
+class MongoDbDltResource(DagsterDltResource):
+    """
+    DagsterDltResource which adds the query plans (see the `explain` option) and
+    the extraction metrics stored by the mongodb source to the metadata of the
+    materialized assets.
+    """
+
+    def extract_resource_metadata(
+        self,
+        context: Union[OpExecutionContext, AssetExecutionContext],
+        resource: DltResource,
+        load_info: LoadInfo,
+        dlt_pipeline: Pipeline,
+    ) -> Mapping[str, Any]:
+        metadata = dict(
+            super().extract_resource_metadata(context, resource, load_info, dlt_pipeline)
+        )
+
+        resource_state = (
+            dlt_pipeline.state.get("sources", {})
+            .get(resource.source_name, {})
+            .get("resources", {})
+            .get(resource.name, {})
+        )
+        for key, value in resource_state.get("query_plan", {}).items():
+            if value is not None:
+                metadata[f"query_plan_{key}"] = value
+        for key, value in resource_state.get("extraction_metrics", {}).items():
+            if value is not None:
+                metadata[f"extraction_{key}"] = value
+
+        return metadata
+
+
+class SnowflakeQueryResource(SnowflakeResource):
+    """
+    SnowflakeResource which fetches query results in Arrow batches rather than row by row
+    like `pd.read_sql`. Iterate `arrow_batches` or `pandas_batches` to work chunk by chunk,
+    `fetch_frame` builds the whole result as one DataFrame.
+    """
+
+    def arrow_batches(self, query: str) -> Iterator[pa.Table]:
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query)
+            yield from cursor.fetch_arrow_batches()
+
+    def pandas_batches(self, query: str) -> Iterator[pd.DataFrame]:
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query)
+            yield from cursor.fetch_pandas_batches()
+
+    def fetch_frame(self, query: str, compact: bool = False) -> pd.DataFrame:
+        """
+        The whole result of `query`. With `compact`, see `compact_dtypes`, the repetitive
+        strings are categories and the integers downcast: group the categories with
+        `observed=True` and widen the integers before any arithmetic that may overflow.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query)
+            columns = [column.name for column in cursor.description]
+            return frame_from_arrow_batches(
+                cursor.fetch_arrow_batches(), columns, compact=compact
+            )
+
+
+def frame_from_arrow_batches(
+    batches: Iterable[pa.Table], columns: List[str], compact: bool = False
+) -> pd.DataFrame:
+    """One DataFrame from the Arrow batches of a result with `columns`."""
+    tables = [_widen_integers(table) for table in batches]
+    if not tables:
+        return pd.DataFrame(columns=columns)
+    table = pa.concat_tables(tables)
+    del tables
+
+    if compact:
+        # categories straight from Arrow, the strings are never Python objects
+        for i, field in enumerate(table.schema):
+            column = table.column(i)
+            if pa.types.is_string(field.type) and (
+                pc.count_distinct(column).as_py() <= CATEGORY_MAX_RATIO * table.num_rows
+            ):
+                table = table.set_column(i, field.name, column.dictionary_encode())
+    df = table.to_pandas(self_destruct=True, split_blocks=True)
+    return compact_dtypes(df) if compact else df
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast the integer columns and turn the repetitive string columns into categories."""
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_integer_dtype(series):
+            df[column] = pd.to_numeric(series, downcast="integer")
+        elif (
+            pd.api.types.is_object_dtype(series)
+            and series.nunique() <= CATEGORY_MAX_RATIO * len(series)
+            and pd.api.types.infer_dtype(series) == "string"
+        ):
+            df[column] = series.astype("category")
+    return df
+
+
+def _widen_integers(table: pa.Table) -> pa.Table:
+    # Snowflake sends each batch with the narrowest integer type of its values, the
+    # batches only concatenate with the same schema
+    return table.cast(
+        pa.schema(
+            pa.field(field.name, pa.int64(), field.nullable)
+            if pa.types.is_integer(field.type)
+            else field
+            for field in table.schema
+        )
+    )
+
 
-snowflake_resource = SnowflakeResource(
+snowflake_resource = SnowflakeQueryResource(
     account=EnvVar("SNOWFLAKE_ACCOUNT"),  # required
     user=EnvVar("SNOWFLAKE_USER"),  # required
     password=EnvVar("SNOWFLAKE_PASSWORD"),  # password or private key required
@@ -13,4 +143,4 @@ snowflake_resource = SnowflakeResource(
     role="dagster_role",
 )
 
-dlt_resource = DagsterDltResource()
\ No newline at end of file
+dlt_resource = MongoDbDltResource()
\ No newline at end of file
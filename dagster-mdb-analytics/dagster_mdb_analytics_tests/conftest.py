@@ -0,0 +1,33 @@
+import os
+import uuid
+
+import dlt
+import pytest
+
+# the pipelines which load send their traces at exit otherwise
+os.environ.setdefault("RUNTIME__DLTHUB_TELEMETRY", "false")
+
+mongomock = pytest.importorskip("mongomock")
+
+from dagster_mdb_analytics.mongodb import helpers
+
+
+@pytest.fixture
+def mongo_client(monkeypatch):
+    """In-memory client the sources get for any connection url."""
+    client = mongomock.MongoClient(tz_aware=True)
+    monkeypatch.setattr(helpers, "_clients", {})
+    monkeypatch.setattr(helpers, "MongoClient", lambda *args, **kwargs: client)
+    return client
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    return dlt.pipeline(
+        pipeline_name=f"test_{uuid.uuid4().hex[:8]}", pipelines_dir=str(tmp_path)
+    )
+
+
+def resource_state(pipeline, resource_name, source_name="mongodb"):
+    return pipeline.state["sources"][source_name]["resources"][resource_name]
+
@@ -0,0 +1,80 @@
+"""mongomock stand-ins for the pymongo APIs mongomock lacks, shared with the benchmarks."""
+
+from itertools import islice
+from typing import Any, Dict, Iterator, List
+
+import bson
+from bson.codec_options import CodecOptions
+from pymongo.errors import OperationFailure
+
+
+class FakeCollection:
+    """mongomock collection with the raw BSON batch cursors of pymongo."""
+
+    def __init__(self, collection: Any) -> None:
+        self._collection = collection
+        # number of documents sent by the raw batch cursors, as a server would
+        self.documents_fetched = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._collection, name)
+
+    @property
+    def codec_options(self) -> CodecOptions:
+        # mongomock has a class of its own, bson wants the pymongo one
+        return CodecOptions(tz_aware=self._collection.codec_options.tz_aware)
+
+    def find_raw_batches(
+        self, filter: Any = None, projection: Any = None, **kwargs: Any
+    ) -> "RawBatchCursor":
+        return RawBatchCursor(
+            self, self._collection.find(filter, projection), kwargs.get("batch_size", 101)
+        )
+
+    def aggregate_raw_batches(
+        self, pipeline: List[Dict[str, Any]], batchSize: int = 101, **kwargs: Any
+    ) -> "RawBatchCursor":
+        return RawBatchCursor(self, self._collection.aggregate(pipeline), batchSize)
+
+
+class NoStatsCollection(FakeCollection):
+    """Collection of a user not allowed to run `$collStats`."""
+
+    def aggregate(self, pipeline: List[Dict[str, Any]], **kwargs: Any) -> Any:
+        if "$collStats" in pipeline[0]:
+            raise OperationFailure("not authorized to run $collStats")
+        return self._collection.aggregate(pipeline, **kwargs)
+
+
+class RawBatchCursor:
+    """Serves the documents of a mongomock cursor as raw BSON batches."""
+
+    def __init__(self, collection: FakeCollection, cursor: Any, batch_size: int = 101) -> None:
+        self.collection = collection
+        self.cursor = cursor
+        self._batch_size = batch_size
+
+    def clone(self) -> "RawBatchCursor":
+        return type(self)(self.collection, self.cursor.clone(), self._batch_size)
+
+    def sort(self, *args: Any, **kwargs: Any) -> "RawBatchCursor":
+        self.cursor = self.cursor.sort(*args, **kwargs)
+        return self
+
+    def skip(self, skip: int) -> "RawBatchCursor":
+        self.cursor = self.cursor.skip(skip)
+        return self
+
+    def limit(self, limit: int) -> "RawBatchCursor":
+        self.cursor = self.cursor.limit(limit)
+        return self
+
+    def batch_size(self, batch_size: int) -> "RawBatchCursor":
+        self._batch_size = batch_size
+        return self
+
+    def __iter__(self) -> Iterator[bytes]:
+        cursor = iter(self.cursor)
+        while batch := list(islice(cursor, self._batch_size)):
+            self.collection.documents_fetched += len(batch)
+            yield b"".join(bson.encode(document) for document in batch)
@@ -0,0 +1,60 @@
+import bson
+import pyarrow as pa
+import pytest
+
+pytest.importorskip("pymongoarrow")
+
+from pymongoarrow.context import PyMongoArrowContext
+from pymongoarrow.lib import process_bson_stream
+
+from dagster_mdb_analytics.mongodb.arrow_schema import (
+    _has_mismatch,
+    _merge_types,
+    auto_pymongoarrow_schema,
+)
+
+from .fakes import FakeCollection
+
+
+def decode(documents, schema, codec_options):
+    context = PyMongoArrowContext.from_schema(schema=schema, codec_options=codec_options)
+    process_bson_stream(b"".join(bson.encode(document) for document in documents), context)
+    return context.finish()
+
+
+def test_mixed_int_and_double_documents(mongo_client, tmp_path):
+    # the older documents hold doubles, the newer ones (sampled first) integers
+    older = [{"price": 1.5 + i, "item": {"size": i}} for i in range(10)]
+    newer = [{"price": i, "item": {"size": 0.5 + i, "name": "x"}} for i in range(10)]
+    mongo_client.db.orders.insert_many(older + newer)
+    collection = FakeCollection(mongo_client.db.orders)
+
+    schema = auto_pymongoarrow_schema(collection, sample_size=20, cache_dir=str(tmp_path))
+
+    arrow_schema = schema.to_arrow()
+    assert arrow_schema.field("price").type == pa.float64()
+    assert arrow_schema.field("item").type == pa.struct(
+        [("size", pa.float64()), ("name", pa.string())]
+    )
+    table = decode(older[:3], schema, collection.codec_options)
+    assert table.column("price").to_pylist() == [1.5, 2.5, 3.5]
+
+
+@pytest.mark.parametrize(
+    "type_, other, merged",
+    [
+        (pa.int64(), pa.float64(), pa.float64()),
+        (pa.float64(), pa.int64(), pa.float64()),
+        (pa.list_(pa.int64()), pa.list_(pa.float64()), pa.list_(pa.float64())),
+        (pa.string(), pa.int64(), pa.string()),
+    ],
+)
+def test_merge_types(type_, other, merged):
+    assert _merge_types(type_, other) == merged
+
+
+def test_wider_cached_schema_is_no_mismatch():
+    cached = pa.schema([("price", pa.float64())])
+
+    assert not _has_mismatch(cached, pa.schema([("price", pa.int64())]))
+    assert _has_mismatch(pa.schema([("price", pa.int64())]), cached)
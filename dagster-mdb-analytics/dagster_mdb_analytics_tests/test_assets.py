@@ -1 +1,97 @@
+from datetime import datetime
 
+import pandas as pd
+import pytest
+
+duckdb = pytest.importorskip("duckdb")
+pytest.importorskip("dagster_snowflake")
+
+from dagster_mdb_analytics.assets.transactions import (
+    TransactionSummaryConfig,
+    stock_transaction_summary_by_date,
+)
+from dagster_mdb_analytics.resources import (
+    SnowflakeQueryResource,
+    frame_from_arrow_batches,
+)
+
+# the tables dlt lands in Snowflake, with nulls, zero volumes and mixed case types
+TRANSACTIONS = [(f"t{i}", 100 + i) for i in range(3)]
+TRANSACTIONS__TRANSACTIONS = [
+    ("t0", datetime(2015, 1, 5, 10), "buy", "amzn", 10, 1.5, 15.0),
+    ("t0", datetime(2015, 1, 5, 16), "BUY", "amzn", 30, 2.5, 75.0),
+    ("t0", datetime(2015, 1, 5, 12), "sell", "amzn", 5, 2.0, 10.0),
+    ("t1", datetime(2015, 1, 5, 9), "buy", "msft", 0, 3.0, 0.0),
+    ("t1", datetime(2015, 1, 6, 9), "Sell", "msft", 7, 3.0, 21.0),
+    ("t2", datetime(2015, 1, 6, 11), "buy", None, 8, 1.0, 8.0),
+    ("t2", datetime(2015, 1, 7, 11), "buy", "ibm", 2, 4.0, 8.0),
+]
+
+database = None
+
+
+class DuckDbQueryResource(SnowflakeQueryResource):
+    """Runs the queries on the fixture tables of a DuckDB database."""
+
+    def fetch_frame(self, query: str, compact: bool = False) -> pd.DataFrame:
+        result = database.execute(query)
+        columns = [column[0] for column in result.description]
+        return frame_from_arrow_batches([result.fetch_arrow_table()], columns, compact=compact)
+
+
+@pytest.fixture
+def snowflake(tmp_path, monkeypatch):
+    global database
+    database = duckdb.connect()
+    database.execute("ATTACH ':memory:' AS DAGSTER_DB")
+    database.execute("CREATE SCHEMA DAGSTER_DB.ANALYTICS")
+    database.execute("CREATE TABLE DAGSTER_DB.ANALYTICS.TRANSACTIONS (_DLT_ID VARCHAR, ACCOUNT_ID BIGINT)")
+    database.execute(
+        """
+        CREATE TABLE DAGSTER_DB.ANALYTICS.TRANSACTIONS__TRANSACTIONS (
+            _DLT_PARENT_ID VARCHAR, DATE TIMESTAMP, TRANSACTION_CODE VARCHAR,
+            SYMBOL VARCHAR, AMOUNT BIGINT, PRICE DOUBLE, TOTAL DOUBLE
+        )
+        """
+    )
+    database.executemany(
+        "INSERT INTO DAGSTER_DB.ANALYTICS.TRANSACTIONS VALUES (?, ?)", TRANSACTIONS
+    )
+    database.executemany(
+        "INSERT INTO DAGSTER_DB.ANALYTICS.TRANSACTIONS__TRANSACTIONS VALUES (?, ?, ?, ?, ?, ?, ?)",
+        TRANSACTIONS__TRANSACTIONS,
+    )
+    # the summary is written to data/ of the working directory
+    (tmp_path / "data").mkdir()
+    monkeypatch.chdir(tmp_path)
+    yield DuckDbQueryResource(account="test", user="test", password="test")
+    database.close()
+
+
+def test_summary_pushdown_matches_pandas(snowflake):
+    pushdown = stock_transaction_summary_by_date(
+        config=TransactionSummaryConfig(pushdown=True), snowflake=snowflake
+    )
+    fallback = stock_transaction_summary_by_date(
+        config=TransactionSummaryConfig(pushdown=False), snowflake=snowflake
+    )
+
+    assert len(pushdown) == 4
+    assert list(pushdown.columns) == list(fallback.columns)
+    # DuckDB sums the integers to a decimal, Snowflake to NUMBER
+    pd.testing.assert_frame_equal(
+        pushdown.astype({"total_volume": "int64"}), fallback, check_dtype=False
+    )
+
+
+def test_summary_fallback_on_categories(snowflake):
+    class CompactQueryResource(DuckDbQueryResource):
+        def fetch_frame(self, query: str, compact: bool = False) -> pd.DataFrame:
+            return super().fetch_frame(query, compact=True)
+
+    fallback = stock_transaction_summary_by_date(
+        config=TransactionSummaryConfig(pushdown=False),
+        snowflake=CompactQueryResource(account="test", user="test", password="test"),
+    )
+
+    assert len(fallback) == 4
@@ -0,0 +1,122 @@
+from itertools import count
+
+import dlt
+import pytest
+from bson.timestamp import Timestamp
+
+pytest.importorskip("duckdb")
+
+from dagster_mdb_analytics.mongodb import helpers, mongodb_collection_changes
+
+from .conftest import resource_state
+
+
+class WatchedCollection:
+    """mongomock collection which records its writes as change stream events."""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.name = collection.name
+        self.events = []
+        self._clock = count(1)
+
+    def insert_one(self, document):
+        self._collection.insert_one(document)
+        self._record("insert", document["_id"])
+
+    def update_one(self, filter_, update):
+        _id = self._collection.find_one(filter_)["_id"]
+        self._collection.update_one(filter_, update)
+        self._record("update", _id)
+
+    def delete_one(self, filter_):
+        _id = self._collection.find_one(filter_)["_id"]
+        self._collection.delete_one(filter_)
+        self._record("delete", _id)
+
+    def watch(self, full_document, resume_after, max_await_time_ms, batch_size):
+        # without a resume token, a stream starts at the current time
+        start = len(self.events) if resume_after is None else resume_after["_data"]
+        return ChangeStream(self.events, start)
+
+    def _record(self, operation, _id):
+        event = {
+            "_id": {"_data": len(self.events) + 1},
+            "operationType": operation,
+            "documentKey": {"_id": _id},
+            "clusterTime": Timestamp(1700000000, next(self._clock)),
+        }
+        if operation != "delete":
+            # `updateLookup`, the document as it is now
+            event["fullDocument"] = self._collection.find_one({"_id": _id})
+        self.events.append(event)
+
+
+class ChangeStream:
+    def __init__(self, events, start):
+        self.events = events
+        self.position = start
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    @property
+    def resume_token(self):
+        return {"_data": self.position}
+
+    def try_next(self):
+        if self.position == len(self.events):
+            return None
+        self.position += 1
+        return self.events[self.position - 1]
+
+
+@pytest.fixture
+def accounts(mongo_client, monkeypatch):
+    collection = WatchedCollection(mongo_client.db.accounts)
+    monkeypatch.setattr(
+        helpers, "MongoClient", lambda *args, **kwargs: {"db": {"accounts": collection}}
+    )
+    return collection
+
+
+def run_changes(pipeline):
+    pipeline.run(
+        mongodb_collection_changes(
+            "mongodb://localhost", database="db", collection="accounts"
+        )
+    )
+
+
+def load_changes(pipeline):
+    run_changes(pipeline)
+    with pipeline.sql_client() as client:
+        return client.execute_sql("SELECT _id, balance FROM accounts ORDER BY _id")
+
+
+def test_changes_are_merged_from_the_resume_token(accounts, tmp_path):
+    pipeline = dlt.pipeline(
+        pipeline_name="changes",
+        pipelines_dir=str(tmp_path),
+        destination=dlt.destinations.duckdb(str(tmp_path / "analytics.duckdb")),
+    )
+    # the first run marks the position, the document is loaded by `mongodb_collection`
+    accounts.insert_one({"_id": 1, "balance": 10})
+    run_changes(pipeline)
+    state = resource_state(pipeline, "accounts", source_name=pipeline.pipeline_name)
+    assert state["resume_token"] == {"_data": 1}
+
+    accounts.insert_one({"_id": 2, "balance": 20})
+    accounts.update_one({"_id": 2}, {"$set": {"balance": 25}})
+    accounts.insert_one({"_id": 3, "balance": 30})
+    accounts.delete_one({"_id": 3})
+    # the latest change of a document by `_change_seq` wins, deletes are removed
+    assert load_changes(pipeline) == [(2, 25)]
+
+    accounts.update_one({"_id": 1}, {"$set": {"balance": 15}})
+    accounts.delete_one({"_id": 2})
+    # continues after the changes loaded by the previous run
+    assert load_changes(pipeline) == [(1, 15)]
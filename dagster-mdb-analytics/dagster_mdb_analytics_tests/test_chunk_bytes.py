@@ -0,0 +1,151 @@
+import copy
+import struct
+
+import bson
+import dlt
+import pytest
+
+from dagster_mdb_analytics.mongodb.helpers import (
+    CollectionArrowLoaderParallel,
+    CollectionLoader,
+    CollectionLoaderParallel,
+    _split_raw_batch,
+    collection_documents,
+)
+
+from .fakes import FakeCollection, NoStatsCollection
+
+# documents from 30 to 270 bytes of BSON
+DOCUMENTS = [{"_id": i, "pad": "x" * (i % 7) * 40} for i in range(40)]
+CHUNK_BYTES = 500
+
+
+class StatsCollection(FakeCollection):
+    """Collection with the storage stats mongomock doesn't have."""
+
+    def __init__(self, collection, stats):
+        super().__init__(collection)
+        self.stats = stats
+
+    def aggregate(self, pipeline, **kwargs):
+        if "$collStats" in pipeline[0]:
+            return iter(self.stats)
+        return self._collection.aggregate(pipeline, **kwargs)
+
+
+def bson_size(documents):
+    return sum(len(bson.encode(document)) for document in documents)
+
+
+def pymongoarrow_schema():
+    from pymongoarrow.api import Schema
+
+    return Schema({"_id": int, "pad": str})
+
+
+@pytest.mark.parametrize(
+    "stats, chunk_size",
+    [
+        ([{"storageStats": {"avgObjSize": 100}}], 10),
+        # `chunk_size` stays the maximum
+        ([{"storageStats": {"avgObjSize": 10}}], 50),
+        # documents larger than `chunk_bytes` are loaded one by one
+        ([{"storageStats": {"avgObjSize": 5000}}], 1),
+        # empty collection
+        ([{"storageStats": {}}], 50),
+        ([], 50),
+    ],
+)
+def test_chunk_size_from_bytes(mongo_client, stats, chunk_size):
+    collection = StatsCollection(mongo_client.db.accounts, stats)
+
+    loader = CollectionLoader(mongo_client, collection, chunk_size=50, chunk_bytes=1000)
+
+    assert loader.chunk_size == chunk_size
+
+
+def test_chunk_size_without_stats(mongo_client):
+    collection = NoStatsCollection(mongo_client.db.accounts)
+
+    loader = CollectionLoader(mongo_client, collection, chunk_size=50, chunk_bytes=1000)
+
+    assert loader.chunk_size == 50
+
+
+@pytest.mark.parametrize("max_bytes", [1, 300, CHUNK_BYTES, 10**6])
+def test_split_raw_batch(max_bytes):
+    batch = b"".join(bson.encode(document) for document in DOCUMENTS)
+
+    chunks = list(_split_raw_batch(batch, max_bytes))
+
+    assert b"".join(chunks) == batch
+    for chunk in chunks:
+        assert len(chunk) <= max_bytes or len(bson.decode_all(chunk)) == 1
+    # a chunk only ends when the next document doesn't fit in it
+    for chunk, next_chunk in zip(chunks, chunks[1:]):
+        assert len(chunk) + struct.unpack_from("<i", next_chunk)[0] > max_bytes
+
+
+def test_parallel_batches_split_by_bytes(mongo_client):
+    mongo_client.db.accounts.insert_many(copy.deepcopy(DOCUMENTS))
+    collection = NoStatsCollection(mongo_client.db.accounts)
+    loader = CollectionLoaderParallel(
+        mongo_client, collection, chunk_size=20, chunk_bytes=CHUNK_BYTES
+    )
+
+    # each deferred batch returns the chunks decoded on the worker
+    chunks = [chunk for run_batch in loader.load_documents({}) for chunk in run_batch()]
+
+    assert [document for chunk in chunks for document in chunk] == DOCUMENTS
+    assert all(bson_size(chunk) <= CHUNK_BYTES for chunk in chunks)
+    assert loader.metrics.bytes == bson_size(DOCUMENTS)
+
+
+def test_parallel_arrow_batches_split_by_bytes(mongo_client):
+    pytest.importorskip("pymongoarrow")
+    mongo_client.db.accounts.insert_many(copy.deepcopy(DOCUMENTS))
+    collection = NoStatsCollection(mongo_client.db.accounts)
+    loader = CollectionArrowLoaderParallel(
+        mongo_client, collection, chunk_size=20, chunk_bytes=CHUNK_BYTES
+    )
+
+    tables = [
+        table
+        for run_batch in loader.load_documents({}, pymongoarrow_schema=pymongoarrow_schema())
+        for table in run_batch()
+    ]
+
+    assert [row for table in tables for row in table.to_pylist()] == DOCUMENTS
+    assert all(bson_size(table.to_pylist()) <= CHUNK_BYTES for table in tables)
+
+
+@pytest.mark.parametrize("data_item_format", ["object", "arrow"])
+def test_parallel_load_split_by_bytes(mongo_client, tmp_path, data_item_format):
+    if data_item_format == "arrow":
+        pytest.importorskip("pymongoarrow")
+    pytest.importorskip("duckdb")
+    mongo_client.db.accounts.insert_many(copy.deepcopy(DOCUMENTS))
+    pipeline = dlt.pipeline(
+        pipeline_name="chunk_bytes",
+        pipelines_dir=str(tmp_path),
+        destination=dlt.destinations.duckdb(str(tmp_path / "analytics.duckdb")),
+    )
+
+    pipeline.run(
+        dlt.resource(collection_documents, name="accounts")(
+            mongo_client,
+            NoStatsCollection(mongo_client.db.accounts),
+            filter_={},
+            projection=None,
+            pymongoarrow_schema=pymongoarrow_schema() if data_item_format == "arrow" else None,
+            parallel=True,
+            chunk_size=20,
+            chunk_bytes=CHUNK_BYTES,
+            data_item_format=data_item_format,
+        )
+    )
+
+    with pipeline.sql_client() as client:
+        assert client.execute_sql("SELECT COUNT(*), COUNT(DISTINCT _id) FROM accounts") == [
+            (40, 40)
+        ]
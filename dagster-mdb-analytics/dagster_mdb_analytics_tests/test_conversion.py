@@ -0,0 +1,73 @@
+import copy
+import datetime
+
+import pytest
+from bson import Decimal128, ObjectId, Regex, Timestamp
+from dlt.common.utils import map_nested_in_place
+
+from dagster_mdb_analytics.mongodb.helpers import ConversionPlan, convert_mongo_objs
+
+OBJECT_IDS = [ObjectId() for _ in range(3)]
+CREATED = datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc)
+
+
+def sample_document(i):
+    return {
+        "_id": OBJECT_IDS[i % 3],
+        "amount": Decimal128(f"{i}.25"),
+        "created": CREATED + datetime.timedelta(days=i),
+        "customer": {"name": f"c{i}", "address": {"city": "Hanoi", "zip": i}},
+        "refs": list(OBJECT_IDS),
+        "prices": [Decimal128("1.10"), Decimal128(f"{i}")],
+        "lines": [{"sku": "a", "qty": i, "price": Decimal128("2.50")}],
+        "tags": ["x", "y"],
+    }
+
+
+DOCUMENTS = [
+    # the sample the plan is compiled from, then documents matching it
+    sample_document(0),
+    sample_document(1),
+    # null and missing fields
+    {**sample_document(2), "amount": None, "customer": None},
+    {key: value for key, value in sample_document(3).items() if key != "created"},
+    {**sample_document(4), "customer": {"name": "c4"}},
+    # list items of other types than in the sample
+    {**sample_document(5), "refs": [OBJECT_IDS[0], None, "plain"]},
+    {**sample_document(6), "tags": ["x", OBJECT_IDS[1], [Decimal128("3")]]},
+    {**sample_document(7), "lines": [{"sku": "b", "price": None}, {"price": Decimal128("1")}]},
+    {**sample_document(8), "lines": [], "prices": []},
+    # types changing under the same keys
+    {**sample_document(9), "created": datetime.datetime(2024, 5, 1, 12, 30)},
+    {
+        **sample_document(10),
+        "amount": 3.5,
+        "customer": {"regex": Regex("^a"), "ts": Timestamp(1714566600, 1)},
+    },
+]
+
+
+def generic(documents):
+    return [map_nested_in_place(convert_mongo_objs, document) for document in documents]
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, len(DOCUMENTS)])
+def test_plan_matches_generic_conversion(batch_size):
+    plan = ConversionPlan()
+    converted = []
+    documents = copy.deepcopy(DOCUMENTS)
+    for start in range(0, len(documents), batch_size):
+        converted.extend(plan.convert(documents[start : start + batch_size]))
+
+    expected = generic(copy.deepcopy(DOCUMENTS))
+    assert converted == expected
+    # the strings and datetimes have the same types, not only equal values
+    assert map_nested_in_place(type, converted) == map_nested_in_place(type, expected)
+
+
+def test_plan_recompiled_for_other_fields():
+    plan = ConversionPlan()
+    plan.convert(copy.deepcopy(DOCUMENTS[:2]))
+
+    others = [{"_id": OBJECT_IDS[0], "items": [{"id": OBJECT_IDS[i % 3]}]} for i in range(4)]
+    assert plan.convert(copy.deepcopy(others)) == generic(copy.deepcopy(others))
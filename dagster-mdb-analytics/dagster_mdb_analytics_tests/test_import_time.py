@@ -0,0 +1,18 @@
+import importlib.util
+from pathlib import Path
+
+# loaded by path, pymongoarrow installs a `benchmarks` package of its own
+spec = importlib.util.spec_from_file_location(
+    "import_time", Path(__file__).parents[1] / "benchmarks" / "import_time.py"
+)
+import_time = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(import_time)
+
+MODULE = "dagster_mdb_analytics.definitions"
+
+
+def test_definitions_imports():
+    times = import_time.import_times(MODULE)
+
+    # the ML and plotting libraries are only imported by the assets when they run
+    assert import_time.forbidden_imports(times, import_time.FORBIDDEN_PACKAGES) == []
@@ -0,0 +1,35 @@
+import pytest
+
+pytest.importorskip("dagster_embedded_elt")
+
+
+@pytest.fixture
+def defs(monkeypatch):
+    # the sources are built without connecting to MongoDB
+    monkeypatch.setenv("SOURCES__MONGODB__CONNECTION_URL", "mongodb://localhost")
+    from dagster_mdb_analytics.definitions import defs
+
+    return defs
+
+
+def test_monthly_collections_have_a_job_of_their_own(defs):
+    from dagster_mdb_analytics.assets.mongodb import mongodb_assets
+
+    def job_asset_keys(name):
+        return set(defs.get_job_def(name).asset_layer.executable_asset_keys)
+
+    monthly = {key for asset in mongodb_assets if asset.partitions_def for key in asset.keys}
+    whole = {key for asset in mongodb_assets if not asset.partitions_def for key in asset.keys}
+
+    assert monthly and whole
+    # a run per month doesn't load the whole collections again
+    assert job_asset_keys("mongodb_monthly_job") == monthly
+    assert job_asset_keys("mongodb_job") == whole
+
+
+def test_transactions_job_materializes_cleaned_transactions(defs):
+    from dagster import AssetKey
+
+    job = defs.get_job_def("transactions_job")
+
+    assert AssetKey("cleaned_transactions") in job.asset_layer.executable_asset_keys
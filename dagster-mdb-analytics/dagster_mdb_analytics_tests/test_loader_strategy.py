@@ -0,0 +1,40 @@
+import pytest
+
+from dagster_mdb_analytics.mongodb.loader_strategy import auto_loader_settings
+
+from .fakes import NoStatsCollection
+
+
+@pytest.fixture
+def accounts(mongo_client):
+    mongo_client.db.accounts.insert_many([{"account_id": i} for i in range(10)])
+    return NoStatsCollection(mongo_client.db.accounts)
+
+
+AUTO_SETTINGS = {
+    "parallel": False,
+    "batch_strategy": "skip",
+    "data_item_format": "arrow",
+    "chunk_size": 100,
+}
+
+
+def test_source_keys_are_no_collection_overrides(accounts, monkeypatch):
+    monkeypatch.setenv("SOURCES__MONGODB__PARALLEL", "true")
+    monkeypatch.setenv("SOURCES__MONGODB__CHUNK_SIZE", "500")
+    monkeypatch.setenv("SOURCES__MONGODB__LOADER__DATA_ITEM_FORMAT", "object")
+    monkeypatch.setenv("DATA_ITEM_FORMAT", "object")
+
+    assert auto_loader_settings(accounts, chunk_size=100) == AUTO_SETTINGS
+
+
+def test_collection_overrides(accounts, monkeypatch):
+    monkeypatch.setenv("SOURCES__MONGODB__LOADER__ACCOUNTS__PARALLEL", "true")
+    monkeypatch.setenv("SOURCES__MONGODB__LOADER__ACCOUNTS__CHUNK_SIZE", "500")
+    monkeypatch.setenv("SOURCES__MONGODB__LOADER__TRANSACTIONS__DATA_ITEM_FORMAT", "object")
+
+    assert auto_loader_settings(accounts, chunk_size=100) == {
+        **AUTO_SETTINGS,
+        "parallel": True,
+        "chunk_size": 500,
+    }
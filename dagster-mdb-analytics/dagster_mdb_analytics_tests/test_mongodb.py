@@ -0,0 +1,254 @@
+import os
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import dlt
+import pytest
+from dlt.pipeline.exceptions import PipelineStepFailed
+from pymongo.errors import AutoReconnect
+
+from dagster_mdb_analytics.mongodb import mongodb
+from dagster_mdb_analytics.mongodb.helpers import (
+    EXPLAIN_DOCS_LIMIT,
+    CollectionLoader,
+    collection_documents,
+)
+
+from .conftest import resource_state
+from .fakes import FakeCollection, RawBatchCursor
+
+
+def test_concurrent_collections(mongo_client, pipeline):
+    database = mongo_client["sample_analytics"]
+    database.accounts.insert_many([{"account_id": i} for i in range(50)])
+    database.transactions.insert_many([{"transaction_count": i} for i in range(30)])
+
+    pipeline.extract(
+        mongodb(
+            "mongodb://localhost",
+            database="sample_analytics",
+            collection_names=["accounts", "transactions"],
+            concurrent=True,
+        )
+    )
+
+    assert resource_state(pipeline, "accounts")["extraction_metrics"]["documents"] == 50
+    assert resource_state(pipeline, "transactions")["extraction_metrics"]["documents"] == 30
+
+
+def test_collection_documents_on_pool_thread(mongo_client, pipeline):
+    # without an incremental argument dlt runs the whole body on a pool thread
+    mongo_client.db.accounts.insert_many([{"account_id": i} for i in range(20)])
+
+    def documents():
+        yield from collection_documents(
+            mongo_client,
+            mongo_client.db.accounts,
+            filter_={},
+            projection=None,
+            pymongoarrow_schema=None,
+        )
+
+    @dlt.source(name="mongodb")
+    def source():
+        yield dlt.resource(documents, name="accounts", parallelized=True)
+
+    pipeline.extract(source())
+
+    assert resource_state(pipeline, "accounts")["extraction_metrics"]["documents"] == 20
+
+
+def accounts_schema():
+    # given, an inferred schema would be cached in the dlt data directory
+    from pymongoarrow.schema import Schema
+    from pymongoarrow.types import ObjectIdType
+
+    return Schema({"_id": ObjectIdType(), "account_id": int})
+
+
+def test_parquet_staging_per_pipeline_run(mongo_client, tmp_path):
+    pytest.importorskip("pymongoarrow")
+    mongo_client.db.accounts.insert_many([{"account_id": i} for i in range(30)])
+    collection = FakeCollection(mongo_client.db.accounts)
+
+    def accounts():
+        return dlt.resource(collection_documents, name="accounts")(
+            mongo_client,
+            collection,
+            filter_={},
+            projection=None,
+            pymongoarrow_schema=accounts_schema(),
+            data_item_format="parquet",
+            chunk_size=10,
+        )
+
+    def staged_runs(pipeline):
+        return os.listdir(
+            os.path.join(pipeline.working_dir, "mongodb_parquet", "db.accounts")
+        )
+
+    first = dlt.pipeline(pipeline_name="first", pipelines_dir=str(tmp_path))
+    second = dlt.pipeline(pipeline_name="second", pipelines_dir=str(tmp_path))
+    first.extract(accounts())
+    second.extract(accounts())
+    info = first.extract(accounts())
+
+    # the second run of a pipeline only removes the files of its own earlier run
+    assert staged_runs(first) == [info.loads_ids[-1]]
+    assert staged_runs(second) == [second.list_extracted_load_packages()[-1]]
+
+
+class ExplainedCollection(FakeCollection):
+    """Answers the explain commands with an index scan examining `docs_examined` documents."""
+
+    def __init__(self, collection, docs_examined):
+        super().__init__(collection)
+        self.database = SimpleNamespace(name=collection.database.name, command=self.command)
+        self.docs_examined = docs_examined
+
+    def command(self, name, command, verbosity):
+        if verbosity == "queryPlanner":
+            plan = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "a_1"}}
+            return {"queryPlanner": {"winningPlan": plan}}
+        returned = min(self.docs_examined, command["limit"])
+        return {"executionStats": {"nReturned": returned, "totalDocsExamined": returned}}
+
+    def count_documents(self, *args, **kwargs):
+        raise AssertionError("counting the documents runs the whole query")
+
+
+@pytest.mark.parametrize(
+    "docs_examined, estimate",
+    [(40, 40), (EXPLAIN_DOCS_LIMIT + 1, 50)],
+    ids=["within_limit", "collection_size"],
+)
+def test_plan_query_estimate(mongo_client, docs_examined, estimate):
+    mongo_client.db.accounts.insert_many([{"a": i} for i in range(50)])
+    collection = ExplainedCollection(mongo_client.db.accounts, docs_examined)
+
+    plan = CollectionLoader(mongo_client, collection, chunk_size=100).plan_query({"a": 1})
+
+    assert plan["scan"] == "IXSCAN"
+    assert plan["docs_examined_estimate"] == estimate
+
+
+def test_arrow_loader_fetches_the_incremental_window(mongo_client, pipeline):
+    pytest.importorskip("pymongoarrow")
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    mongo_client.db.accounts.insert_many(
+        [{"account_id": i, "updated_at": start + timedelta(days=i)} for i in range(100)]
+    )
+    collection = FakeCollection(mongo_client.db.accounts)
+
+    pipeline.extract(
+        dlt.resource(collection_documents, name="accounts")(
+            mongo_client,
+            collection,
+            filter_={},
+            projection=None,
+            pymongoarrow_schema=None,
+            incremental=dlt.sources.incremental(
+                "updated_at", initial_value=start + timedelta(days=60)
+            ),
+            data_item_format="arrow",
+        )
+    )
+
+    # the window is filtered by the server, not by dlt after fetching everything
+    assert collection.documents_fetched == 40
+    state = resource_state(pipeline, "accounts", source_name=pipeline.pipeline_name)
+    assert state["extraction_metrics"]["documents"] == 40
+
+
+@pytest.mark.parametrize("batch_strategy", ["skip", "range", "keyset"])
+@pytest.mark.parametrize("incremental", [False, True])
+def test_parallel_batches_load_each_document_once(
+    mongo_client, pipeline, batch_strategy, incremental
+):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    # runs of 10 documents share a cursor value, longer than a batch
+    mongo_client.db.accounts.insert_many(
+        [{"_id": i, "updated_at": start + timedelta(days=i // 10)} for i in range(95)]
+    )
+    loaded = []
+
+    pipeline.extract(
+        dlt.resource(collection_documents, name="accounts")(
+            mongo_client,
+            mongo_client.db.accounts,
+            filter_={},
+            projection=None,
+            pymongoarrow_schema=None,
+            incremental=(
+                dlt.sources.incremental("updated_at", initial_value=start + timedelta(days=2))
+                if incremental
+                else None
+            ),
+            parallel=True,
+            chunk_size=7,
+            batch_strategy=batch_strategy,
+        ).add_map(lambda document: loaded.append(document["_id"]) or document)
+    )
+
+    assert sorted(loaded) == list(range(20 if incremental else 0, 95))
+
+
+class InterruptedCursor(RawBatchCursor):
+    """Loses the connection once, when more than `fail_after` documents were fetched."""
+
+    def __iter__(self):
+        for batch in super().__iter__():
+            if self.collection.documents_fetched > self.collection.fail_after:
+                self.collection.fail_after = float("inf")
+                raise AutoReconnect("connection lost")
+            yield batch
+
+
+class InterruptedCollection(FakeCollection):
+    def __init__(self, collection, fail_after):
+        super().__init__(collection)
+        self.fail_after = fail_after
+
+    def find_raw_batches(self, filter=None, projection=None, **kwargs):
+        return InterruptedCursor(
+            self, self._collection.find(filter, projection), kwargs["batch_size"]
+        )
+
+
+def test_checkpoint_resumes_a_failed_load(mongo_client, tmp_path):
+    pytest.importorskip("pymongoarrow")
+    pytest.importorskip("duckdb")
+    mongo_client.db.accounts.insert_many([{"account_id": i} for i in range(250)])
+    # files of 10 row groups of 10 documents, the first is finished when the load fails
+    collection = InterruptedCollection(mongo_client.db.accounts, fail_after=150)
+    pipeline = dlt.pipeline(
+        pipeline_name="checkpoint",
+        pipelines_dir=str(tmp_path),
+        destination=dlt.destinations.duckdb(str(tmp_path / "analytics.duckdb")),
+    )
+
+    def run():
+        pipeline.run(
+            dlt.resource(collection_documents, name="accounts")(
+                mongo_client,
+                collection,
+                filter_={},
+                projection=None,
+                pymongoarrow_schema=accounts_schema(),
+                data_item_format="parquet",
+                chunk_size=10,
+                checkpoint=True,
+            )
+        )
+
+    with pytest.raises(PipelineStepFailed):
+        run()
+    collection.documents_fetched = 0
+    run()
+
+    # the 100 documents of the finished file aren't fetched again
+    assert collection.documents_fetched == 150
+    with pipeline.sql_client() as client:
+        assert client.execute_sql(
+            "SELECT COUNT(*), COUNT(DISTINCT account_id) FROM accounts"
+        ) == [(250, 250)]
@@ -0,0 +1,54 @@
+import os
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("dagster_embedded_elt")
+
+
+class FakeDltResource:
+    """Runs nothing, records the pipeline and fails when told to."""
+
+    def __init__(self, fail):
+        self.fail = fail
+        self.pipelines = []
+
+    def run(self, context, dlt_source, dlt_pipeline, write_disposition):
+        self.pipelines.append(dlt_pipeline)
+        os.makedirs(dlt_pipeline.working_dir, exist_ok=True)
+        if self.fail:
+            raise RuntimeError("load failed")
+        yield "materialized"
+
+
+def test_partition_directory_is_kept_until_loaded(monkeypatch, tmp_path):
+    monkeypatch.setenv("SOURCES__MONGODB__CONNECTION_URL", "mongodb://localhost")
+    from dagster_mdb_analytics.assets import mongodb as mongodb_assets
+
+    monkeypatch.setattr(mongodb_assets, "get_dlt_pipelines_dir", lambda: str(tmp_path))
+    context = SimpleNamespace(
+        partition_time_window=SimpleNamespace(
+            start=datetime(2015, 1, 1, tzinfo=timezone.utc),
+            end=datetime(2015, 2, 1, tzinfo=timezone.utc),
+        )
+    )
+
+    def run_partition(dlt_resource):
+        return list(
+            mongodb_assets.run_partition(
+                context, dlt_resource, "transactions", "bucket_start_date", "db", {}
+            )
+        )
+
+    failed = FakeDltResource(fail=True)
+    with pytest.raises(RuntimeError):
+        run_partition(failed)
+    # the retry finds the checkpoint of the failed run
+    pipelines_dir = failed.pipelines[0].pipelines_dir
+    assert os.path.isdir(failed.pipelines[0].working_dir)
+
+    loaded = FakeDltResource(fail=False)
+    assert run_partition(loaded) == ["materialized"]
+    assert loaded.pipelines[0].pipelines_dir == pipelines_dir
+    assert not os.path.exists(pipelines_dir)
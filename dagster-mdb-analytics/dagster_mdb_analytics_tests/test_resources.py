@@ -0,0 +1,72 @@
+import dlt
+import pyarrow as pa
+import pytest
+
+pytest.importorskip("dagster_snowflake")
+
+from dagster_mdb_analytics.resources import MongoDbDltResource, frame_from_arrow_batches
+
+# Snowflake sends each batch with the narrowest integer type of its values
+BATCHES = [
+    pa.table({"VOLUME": pa.array([100, 20], pa.int8()), "TYPE": ["buy", "buy"]}),
+    pa.table({"VOLUME": pa.array([30000, 4], pa.int16()), "TYPE": ["sell", "buy"]}),
+]
+
+
+def test_frame_keeps_wide_dtypes():
+    df = frame_from_arrow_batches(BATCHES, ["VOLUME", "TYPE"])
+
+    assert df["VOLUME"].dtype == "int64"
+    assert df["TYPE"].dtype == object
+    # no overflow in arithmetic on the fetched integers
+    assert (df["VOLUME"] * 1000).tolist() == [100000, 20000, 30000000, 4000]
+
+
+def test_compact_frame():
+    df = frame_from_arrow_batches(BATCHES, ["VOLUME", "TYPE"], compact=True)
+
+    assert df["VOLUME"].dtype == "int16"
+    assert df["TYPE"].dtype == "category"
+    assert df.groupby("TYPE", observed=True)["VOLUME"].count().to_dict() == {
+        "buy": 3,
+        "sell": 1,
+    }
+
+
+def test_empty_result():
+    df = frame_from_arrow_batches([], ["VOLUME", "TYPE"])
+
+    assert df.empty
+    assert list(df.columns) == ["VOLUME", "TYPE"]
+
+
+def test_mongodb_metadata(tmp_path):
+    pytest.importorskip("duckdb")
+
+    @dlt.source(name="mongodb")
+    def source():
+        @dlt.resource(name="accounts")
+        def accounts():
+            state = dlt.current.resource_state()
+            state["query_plan"] = {"scan": "IXSCAN", "index": None}
+            state["extraction_metrics"] = {"documents": 2}
+            yield [{"account_id": 1}, {"account_id": 2}]
+
+        return accounts
+
+    pipeline = dlt.pipeline(
+        pipeline_name="metadata",
+        pipelines_dir=str(tmp_path),
+        destination=dlt.destinations.duckdb(str(tmp_path / "analytics.duckdb")),
+    )
+    mongodb = source()
+    load_info = pipeline.run(mongodb)
+
+    metadata = MongoDbDltResource().extract_resource_metadata(
+        None, mongodb.resources["accounts"], load_info, pipeline
+    )
+
+    assert metadata["query_plan_scan"] == "IXSCAN"
+    assert "query_plan_index" not in metadata
+    assert metadata["extraction_documents"] == 2
+    assert metadata["rows_loaded"].value == 2
@@ -4,12 +4,16 @@ setup(
     name="dagster_mdb_analytics",
     packages=find_packages(exclude=["dagster_mdb_analytics_tests"]),
     install_requires=[
-        "dagster==1.7.7",
-        "dagster-cloud==1.7.7",
-        "dagster-snowflake==0.23.7",
+        "dagster==1.8.13",
+        "dagster-cloud==1.8.13",
+        "dagster-embedded-elt==0.24.13",
+        "dagster-snowflake==0.24.13",
         "pymongo>=4.3.3",
-        "dlt[snowflake]>=0.3.5",
+        "dlt[snowflake]>=1.5",
         "scikit-learn==1.5.0"
     ],
-    extras_require={"dev": ["dagster-webserver", "pytest"]},
+    extras_require={
+        "dev": ["dagster-webserver", "pytest", "mongomock", "duckdb"],
+        "compression": ["pymongo[snappy,zstd]"],
+    },
 )